@@ -4,6 +4,7 @@ Business logic for demand and volume forecasting
 """
 
 import boto3
+import gzip
 import json
 import pandas as pd
 from typing import List, Optional, Dict, Any
@@ -132,8 +133,10 @@ class ForecastService:
                 Key=latest_file['Key']
             )
             
-            # Read JSON forecast data
-            json_content = file_response['Body'].read().decode('utf-8')
+            # Read JSON forecast data (generated outputs are gzip-compressed .json.gz)
+            json_content = file_response['Body'].read()
+            if latest_file['Key'].endswith('.gz'):
+                json_content = gzip.decompress(json_content)
             forecast_data = json.loads(json_content)
             
             forecasts = []
@@ -301,8 +304,10 @@ class ForecastService:
                 Key=latest_file['Key']
             )
             
-            # Read JSON forecast data
-            json_content = file_response['Body'].read().decode('utf-8')
+            # Read JSON forecast data (generated outputs are gzip-compressed .json.gz)
+            json_content = file_response['Body'].read()
+            if latest_file['Key'].endswith('.gz'):
+                json_content = gzip.decompress(json_content)
             forecast_data = json.loads(json_content)
             
             if forecast_type == "volume":
@@ -132,34 +132,39 @@ class S3DataService:
             print(f"Error fetching utilization forecast data: {str(e)}")
             return []
     
+    def _read_partitioned_parquet(self, prefix: str) -> pd.DataFrame:
+        """
+        Read every part file of a Hive-partitioned Parquet dataset under prefix
+        
+        The Glue jobs append Year=/Month= partitions, so the partition values only
+        exist in the key path; they are restored here as integer columns.
+        """
+        frames = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if not key.endswith('.parquet'):
+                    continue
+                
+                file_response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+                df = pd.read_parquet(io.BytesIO(file_response['Body'].read()))
+                for part in key[len(prefix):].split('/')[:-1]:
+                    column, sep, value = part.partition('=')
+                    if sep:
+                        df[column] = int(value) if value.isdigit() else value
+                frames.append(df)
+        
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+    
     async def get_processed_inbound_data(self) -> pd.DataFrame:
         """
-        Fetch processed inbound data from Parquet files
+        Fetch processed inbound data from the Year/Month partitioned Parquet dataset
         """
         try:
-            # List processed inbound files
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix="processed/clean-inbound/"
-            )
-            
-            if 'Contents' not in response:
-                return pd.DataFrame()
-            
-            # Get the most recent file
-            latest_file = max(response['Contents'], key=lambda x: x['LastModified'])
-            
-            # Download and read Parquet file
-            file_response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=latest_file['Key']
-            )
-            
-            # Read Parquet data
-            parquet_data = file_response['Body'].read()
-            df = pd.read_parquet(io.BytesIO(parquet_data))
-            
-            return df
+            return self._read_partitioned_parquet("processed/clean-inbound/")
             
         except Exception as e:
             print(f"Error fetching processed inbound data: {str(e)}")
@@ -167,32 +172,10 @@ class S3DataService:
     
     async def get_processed_outbound_data(self) -> pd.DataFrame:
         """
-        Fetch processed outbound data from Parquet files
+        Fetch processed outbound data from the Year/Month partitioned Parquet dataset
         """
         try:
-            # List processed outbound files
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix="processed/clean-outbound/"
-            )
-            
-            if 'Contents' not in response:
-                return pd.DataFrame()
-            
-            # Get the most recent file
-            latest_file = max(response['Contents'], key=lambda x: x['LastModified'])
-            
-            # Download and read Parquet file
-            file_response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=latest_file['Key']
-            )
-            
-            # Read Parquet data
-            parquet_data = file_response['Body'].read()
-            df = pd.read_parquet(io.BytesIO(parquet_data))
-            
-            return df
+            return self._read_partitioned_parquet("processed/clean-outbound/")
             
         except Exception as e:
             print(f"Error fetching processed outbound data: {str(e)}")
@@ -13,6 +13,9 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Shared PCG64 generator for bootstrap resampling
+_RNG = np.random.default_rng()
+
 class AccuracyMetricType(Enum):
     """Types of accuracy metrics"""
     MAPE = "mape"  # Mean Absolute Percentage Error
@@ -580,7 +583,7 @@ class KPICalculator:
             
             for _ in range(n_bootstrap):
                 # Bootstrap sample
-                indices = np.random.choice(n, size=n, replace=True)
+                indices = _RNG.integers(0, n, size=n)
                 sample_actual = actual[indices]
                 sample_forecast = forecast[indices]
                 
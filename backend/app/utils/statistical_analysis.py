@@ -37,6 +37,9 @@ class StatisticalAnalyzer:
             Dictionary with seasonality analysis results
         """
         try:
+            # Keep float32 inputs in single precision so the FFT runs the float32 kernel
+            data = np.ascontiguousarray(data)
+            
             if len(data) < 14:  # Need at least 2 weeks of data
                 return {
                     'has_seasonality': False,
@@ -49,6 +52,9 @@ class StatisticalAnalyzer:
             # Remove trend and mean
             detrended = self._detrend_data(data)
             
+            if len(data) < 64:  # Short series: ACF avoids the FFT/peak-finding setup cost
+                return self._detect_seasonality_acf(detrended, min_strength)
+            
             # Perform FFT
             fft_values = fft(detrended)
             frequencies = fftfreq(len(detrended))
@@ -64,23 +70,20 @@ class StatisticalAnalyzer:
             )
             
             # Convert frequency indices to periods
-            periods = []
-            strengths = []
-            
-            for peak_idx in peaks:
-                if frequencies[peak_idx] > 0:  # Avoid zero frequency
-                    period = 1.0 / frequencies[peak_idx]
-                    if 2 <= period <= len(data) / 2:  # Reasonable period range
-                        strength = power[peak_idx] / np.sum(power)
-                        if strength >= min_strength:
-                            periods.append(period)
-                            strengths.append(strength)
+            peaks = peaks[frequencies[peaks] > 0]  # Avoid zero frequency
+            periods_arr = 1.0 / frequencies[peaks]
+            strengths_arr = power[peaks] / np.sum(power)
+            
+            # Reasonable period range and minimum strength
+            keep = (periods_arr >= 2) & (periods_arr <= len(data) / 2) & (strengths_arr >= min_strength)
+            periods_arr = periods_arr[keep]
+            strengths_arr = strengths_arr[keep]
             
             # Sort by strength
-            if periods:
-                sorted_indices = np.argsort(strengths)[::-1]
-                periods = [periods[i] for i in sorted_indices]
-                strengths = [strengths[i] for i in sorted_indices]
+            if periods_arr.size:
+                order = np.argsort(strengths_arr)[::-1]
+                periods = periods_arr[order].tolist()
+                strengths = strengths_arr[order].tolist()
                 
                 # Classify periods
                 patterns = []
@@ -118,12 +121,63 @@ class StatisticalAnalyzer:
                 'error': str(e)
             }
     
+    def _detect_seasonality_acf(self, detrended: np.ndarray, min_strength: float) -> Dict[str, Any]:
+        """Detect seasonality in short detrended series from autocorrelation peaks"""
+        n = len(detrended)
+        acf = np.correlate(detrended, detrended, mode='full')[n - 1:]
+        if acf[0] <= 0:
+            return {
+                'has_seasonality': False,
+                'patterns': [],
+                'dominant_period': None,
+                'strength': 0.0
+            }
+        acf = acf / acf[0]
+        
+        # Local maxima between lag 2 and n/2 that clear the strength threshold
+        max_lag = n // 2
+        inner = acf[2:max_lag + 1]
+        is_peak = (inner > acf[1:max_lag]) & (inner >= acf[3:max_lag + 2]) & (inner >= min_strength)
+        lags = np.flatnonzero(is_peak) + 2
+        
+        if not lags.size:
+            return {
+                'has_seasonality': False,
+                'patterns': [],
+                'dominant_period': None,
+                'strength': 0.0
+            }
+        
+        order = np.argsort(acf[lags])[::-1]
+        periods = lags[order].astype(float).tolist()
+        strengths = acf[lags][order].astype(float).tolist()
+        
+        patterns = [
+            {
+                'type': self._classify_period(period),
+                'period': period,
+                'strength': strength,
+                'frequency': 1.0 / period
+            }
+            for period, strength in zip(periods, strengths)
+        ]
+        
+        return {
+            'has_seasonality': True,
+            'patterns': patterns,
+            'dominant_period': periods[0],
+            'dominant_strength': strengths[0],
+            'all_periods': periods,
+            'all_strengths': strengths
+        }
+    
     def _detrend_data(self, data: np.ndarray) -> np.ndarray:
         """Remove linear trend from data"""
         try:
             x = np.arange(len(data))
             slope, intercept, _, _, _ = stats.linregress(x, data)
-            trend = slope * x + intercept
+            # Build the trend in the input precision so float32 data is not upcast
+            trend = (slope * x + intercept).astype(np.result_type(data.dtype, np.float32), copy=False)
             return data - trend
         except:
             return data - np.mean(data)
@@ -312,6 +366,8 @@ class StatisticalAnalyzer:
             Dictionary with volatility metrics
         """
         try:
+            data = np.ascontiguousarray(data)
+            
             if len(data) < 2:
                 return {
                     'coefficient_of_variation': 0.0,
@@ -368,10 +424,10 @@ class StatisticalAnalyzer:
             threshold: Threshold for outlier detection
             
         Returns:
-            Dictionary with outlier detection results
+            Dictionary with outlier detection results (outlier_indices as an ndarray)
         """
         try:
-            outlier_indices = []
+            data = np.ascontiguousarray(data)
             
             if method == 'iqr':
                 Q1 = np.percentile(data, 25)
@@ -379,20 +435,29 @@ class StatisticalAnalyzer:
                 IQR = Q3 - Q1
                 lower_bound = Q1 - threshold * IQR
                 upper_bound = Q3 + threshold * IQR
-                outlier_indices = np.where((data < lower_bound) | (data > upper_bound))[0]
+                outlier_indices = np.flatnonzero((data < lower_bound) | (data > upper_bound))
                 
             elif method == 'zscore':
-                z_scores = np.abs(stats.zscore(data))
-                outlier_indices = np.where(z_scores > threshold)[0]
+                mu = data.mean()
+                sigma = data.std()
+                if sigma == 0:
+                    outlier_indices = np.empty(0, dtype=np.intp)
+                else:
+                    z_scores = np.abs((data - mu) / sigma)
+                    outlier_indices = np.flatnonzero(z_scores > threshold)
                 
             elif method == 'modified_zscore':
                 median = np.median(data)
                 mad = np.median(np.abs(data - median))
                 modified_z_scores = 0.6745 * (data - median) / mad
-                outlier_indices = np.where(np.abs(modified_z_scores) > threshold)[0]
+                outlier_indices = np.flatnonzero(np.abs(modified_z_scores) > threshold)
+                
+            else:
+                raise ValueError(f"Unknown outlier method: {method}")
             
+            # Indices stay an ndarray; callers needing Python ints can call .tolist()
             return {
-                'outlier_indices': outlier_indices.tolist(),
+                'outlier_indices': outlier_indices,
                 'outlier_count': len(outlier_indices),
                 'outlier_percentage': (len(outlier_indices) / len(data)) * 100,
                 'method_used': method,
@@ -401,7 +466,7 @@ class StatisticalAnalyzer:
             
         except Exception as e:
             return {
-                'outlier_indices': [],
+                'outlier_indices': np.empty(0, dtype=np.intp),
                 'outlier_count': 0,
                 'outlier_percentage': 0.0,
                 'method_used': method,
@@ -473,15 +538,17 @@ class StatisticalAnalyzer:
     def _calculate_effect_size(self, sample1: np.ndarray, sample2: np.ndarray) -> float:
         """Calculate Cohen's d effect size"""
         try:
+            sample1 = np.ascontiguousarray(sample1)
+            sample2 = np.ascontiguousarray(sample2)
             mean1, mean2 = np.mean(sample1), np.mean(sample2)
-            std1, std2 = np.std(sample1, ddof=1), np.std(sample2, ddof=1)
+            var1, var2 = np.var(sample1, ddof=1), np.var(sample2, ddof=1)
             n1, n2 = len(sample1), len(sample2)
             
-            # Pooled standard deviation
-            pooled_std = np.sqrt(((n1 - 1) * std1**2 + (n2 - 1) * std2**2) / (n1 + n2 - 2))
+            # Pooled variance (squared std is never materialised)
+            pooled_var = ((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2)
             
             # Cohen's d
-            cohens_d = (mean1 - mean2) / pooled_std
+            cohens_d = (mean1 - mean2) / np.sqrt(pooled_var)
             return float(cohens_d)
             
         except:
@@ -501,6 +568,8 @@ class StatisticalAnalyzer:
             Dictionary with decomposition results
         """
         try:
+            data = np.ascontiguousarray(data)
+            
             if len(data) < 10:
                 return {
                     'trend': data.copy(),
@@ -3,16 +3,216 @@ Statistical Metrics Utilities
 Advanced statistical calculations for forecast analysis and risk assessment
 """
 
+import os
+import types
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict, Optional, Union
 from scipy import stats
 from scipy.stats import norm, t, chi2
+from scipy.linalg import solve_triangular
 from statsmodels.tsa.seasonal import seasonal_decompose
-from statsmodels.tsa.stattools import adfuller, kpss
+from statsmodels.tsa.stattools import adfuller, kpss, acf
+from joblib import Parallel, delayed
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; metrics fall back to NumPy
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr
+    NUMEXPR_AVAILABLE = True
+except ImportError:  # numexpr is optional; element-wise expressions fall back to NumPy
+    NUMEXPR_AVAILABLE = False
+
+# Shared PCG64 generator for in-process resampling
+_RNG = np.random.default_rng()
+
+# Upper bound on resample indices materialised at once by the vectorized bootstrap
+_BOOTSTRAP_BLOCK_ELEMENTS = 1 << 22
+
+# Total resampled elements (n * n_bootstrap) above which bootstrap work is spread across processes
+_PARALLEL_BOOTSTRAP_MIN_ELEMENTS = 1 << 24
+
+# Seasonal periods memoised by (length, hash of values); oldest entries are evicted first
+_SEASONAL_PERIOD_CACHE: Dict[Tuple[int, int], int] = {}
+_SEASONAL_PERIOD_CACHE_SIZE = 256
+
+# Input length below which metrics use the eagerly compiled serial kernels
+_SMALL_KERNEL_SIZE = 1000
+
+# LLVM fast-math flags for the metric kernels; nnan and ninf are left out so NaN and inf
+# inputs propagate to the result as they do in NumPy instead of being assumed away
+_FASTMATH_FLAGS = {'contract', 'reassoc', 'arcp', 'nsz', 'afn'}
+
+# Array size from which numexpr's threaded block evaluation beats chained NumPy temporaries
+_NUMEXPR_MIN_SIZE = 1 << 15
+
+
+if NUMBA_AVAILABLE:
+    def _mape_impl(actual, forecast):
+        """Single-pass MAPE over non-zero actuals"""
+        acc = 0.0
+        cnt = 0
+        for i in prange(actual.size):
+            if actual[i] != 0:
+                acc += abs((actual[i] - forecast[i]) / actual[i])
+                cnt += 1
+        if cnt == 0:
+            return np.nan
+        return acc / cnt * 100
+    
+    def _smape_impl(actual, forecast):
+        """Single-pass SMAPE over points with a non-zero denominator"""
+        acc = 0.0
+        cnt = 0
+        for i in prange(actual.size):
+            den = (abs(actual[i]) + abs(forecast[i])) * 0.5
+            if den != 0:
+                acc += abs(actual[i] - forecast[i]) / den
+                cnt += 1
+        if cnt == 0:
+            return np.nan
+        return acc / cnt * 100
+    
+    def _all_metrics_impl(actual, forecast):
+        """Single-pass MAPE, WAPE, MAE, RMSE, bias, SMAPE and MSE"""
+        n = actual.size
+        err_sum = 0.0
+        abs_err_sum = 0.0
+        sq_err_sum = 0.0
+        abs_actual_sum = 0.0
+        ape_sum = 0.0
+        ape_cnt = 0
+        sape_sum = 0.0
+        sape_cnt = 0
+        for i in prange(n):
+            a = actual[i]
+            f = forecast[i]
+            d = f - a
+            ad = abs(d)
+            err_sum += d
+            abs_err_sum += ad
+            sq_err_sum += d * d
+            abs_actual_sum += abs(a)
+            if a != 0:
+                ape_sum += ad / abs(a)
+                ape_cnt += 1
+            den = (abs(a) + abs(f)) / 2
+            if den != 0:
+                sape_sum += ad / den
+                sape_cnt += 1
+        
+        mse = sq_err_sum / n if n else np.nan
+        mape = ape_sum / ape_cnt * 100 if ape_cnt else np.nan
+        smape = sape_sum / sape_cnt * 100 if sape_cnt else np.nan
+        wape = abs_err_sum / abs_actual_sum * 100 if abs_actual_sum != 0 else np.nan
+        mae = abs_err_sum / n if n else np.nan
+        bias = err_sum / n if n else np.nan
+        return mape, wape, mae, np.sqrt(mse), bias, smape, mse
+    
+    def _serial_kernel(impl, signature):
+        """
+        Eagerly compile a serial copy of a metric kernel for small inputs
+        
+        The copy gets its own qualified name so its on-disk cache entry does
+        not collide with the parallel build of the same function.
+        """
+        func = types.FunctionType(impl.__code__, impl.__globals__, impl.__name__ + '_serial')
+        func.__qualname__ = impl.__qualname__ + '_serial'
+        return njit(signature, fastmath=_FASTMATH_FLAGS, cache=True)(func)
+    
+    # Parallel kernels, specialised lazily per input dtype
+    _mape_kernel = njit(parallel=True, fastmath=_FASTMATH_FLAGS, cache=True)(_mape_impl)
+    _smape_kernel = njit(parallel=True, fastmath=_FASTMATH_FLAGS, cache=True)(_smape_impl)
+    _all_metrics_kernel = njit(parallel=True, fastmath=_FASTMATH_FLAGS, cache=True)(_all_metrics_impl)
+    
+    # Serial float64 kernels compiled at import, used below _SMALL_KERNEL_SIZE where
+    # thread start-up and NumPy dispatch outweigh the arithmetic. Like the parallel
+    # kernels they trust their inputs; callers pass them through _metric_inputs first
+    _mape_kernel_small = _serial_kernel(_mape_impl, 'float64(float64[::1], float64[::1])')
+    _smape_kernel_small = _serial_kernel(_smape_impl, 'float64(float64[::1], float64[::1])')
+    _all_metrics_kernel_small = _serial_kernel(
+        _all_metrics_impl, 'UniTuple(float64, 7)(float64[::1], float64[::1])'
+    )
+    
+    @njit(cache=True)
+    def _mean_sem(values):
+        """Mean and standard error of the mean (ddof=1) in two tight loops"""
+        n = values.size
+        total = 0.0
+        for i in range(n):
+            total += values[i]
+        mean = total / n
+        if n < 2:
+            return mean, np.nan
+        ss = 0.0
+        for i in range(n):
+            d = values[i] - mean
+            ss += d * d
+        return mean, np.sqrt(ss / (n - 1) / n)
+    
+    @njit(cache=True)
+    def _ewma_var_last(values, alpha):
+        """
+        Terminal value of pandas' adjusted, bias-corrected EWM variance
+        
+        Same online update as pandas' ewmcov, keeping only O(1) state.
+        NaNs decay the weights but do not update the moments.
+        """
+        decay = 1.0 - alpha
+        mean = np.nan
+        var = 0.0
+        sum_wt = 0.0
+        sum_wt2 = 0.0
+        old_wt = 0.0
+        started = False
+        for i in range(values.size):
+            x = values[i]
+            is_obs = not np.isnan(x)
+            if not started:
+                if is_obs:
+                    mean = x
+                    sum_wt = 1.0
+                    sum_wt2 = 1.0
+                    old_wt = 1.0
+                    started = True
+                continue
+            sum_wt *= decay
+            sum_wt2 *= decay * decay
+            old_wt *= decay
+            if is_obs:
+                old_mean = mean
+                if mean != x:
+                    mean = (old_wt * old_mean + x) / (old_wt + 1.0)
+                var = (old_wt * (var + (old_mean - mean) ** 2) + (x - mean) ** 2) / (old_wt + 1.0)
+                sum_wt += 1.0
+                sum_wt2 += 1.0
+                old_wt += 1.0
+        
+        numerator = sum_wt * sum_wt
+        denominator = numerator - sum_wt2
+        if denominator > 0:
+            return numerator / denominator * var
+        return np.nan
+
+
+def _metric_inputs(actual, forecast, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten a same-shaped actual/forecast pair into contiguous arrays for the metric kernels"""
+    actual = np.ascontiguousarray(actual, dtype=dtype)
+    forecast = np.ascontiguousarray(forecast, dtype=dtype)
+    # The kernels index forecast by position over actual.size, so a mismatch would read garbage
+    if actual.shape != forecast.shape:
+        raise ValueError(
+            f"actual and forecast must have the same shape, got {actual.shape} and {forecast.shape}"
+        )
+    return actual.ravel(), forecast.ravel()
+
 
 def calculate_mape(actual: np.ndarray, forecast: np.ndarray) -> float:
     """
@@ -25,8 +225,17 @@ def calculate_mape(actual: np.ndarray, forecast: np.ndarray) -> float:
     Returns:
         MAPE value as percentage
     """
+    actual, forecast = _metric_inputs(actual, forecast)
+    if NUMBA_AVAILABLE:
+        if actual.size < _SMALL_KERNEL_SIZE:
+            return _mape_kernel_small(actual, forecast)
+        return _mape_kernel(actual, forecast)
+    
+    # Masked divide into a zeroed buffer instead of fancy-indexed copies
     mask = actual != 0
-    return np.mean(np.abs((actual[mask] - forecast[mask]) / actual[mask])) * 100
+    ratios = np.zeros_like(actual)
+    np.divide(np.abs(actual - forecast), np.abs(actual), out=ratios, where=mask)
+    return ratios.sum() / mask.sum() * 100
 
 
 def calculate_wape(actual: np.ndarray, forecast: np.ndarray) -> float:
@@ -96,30 +305,122 @@ def calculate_smape(actual: np.ndarray, forecast: np.ndarray) -> float:
     Returns:
         SMAPE value as percentage
     """
-    denominator = (np.abs(actual) + np.abs(forecast)) / 2
+    actual, forecast = _metric_inputs(actual, forecast)
+    if NUMBA_AVAILABLE:
+        if actual.size < _SMALL_KERNEL_SIZE:
+            return _smape_kernel_small(actual, forecast)
+        return _smape_kernel(actual, forecast)
+    
+    denominator = np.abs(actual)
+    denominator += np.abs(forecast)
+    denominator /= 2
     mask = denominator != 0
-    return np.mean(np.abs(actual[mask] - forecast[mask]) / denominator[mask]) * 100
+    ratios = np.zeros_like(actual)
+    np.divide(np.abs(actual - forecast), denominator, out=ratios, where=mask)
+    return ratios.sum() / mask.sum() * 100
 
 
-def calculate_all_accuracy_metrics(actual: np.ndarray, forecast: np.ndarray) -> Dict[str, float]:
+def calculate_all_accuracy_metrics(
+    actual: np.ndarray,
+    forecast: np.ndarray,
+    high_precision: bool = True
+) -> Dict[str, float]:
     """
     Calculate all accuracy metrics at once
     
     Args:
         actual: Array of actual values
         forecast: Array of forecasted values
+        high_precision: Store inputs as float64; False reads them as float32
+            (sums are still accumulated in float64)
         
     Returns:
         Dictionary of all accuracy metrics
     """
+    dtype = np.float64 if high_precision else np.float32
+    actual, forecast = _metric_inputs(actual, forecast, dtype)
+    
+    if NUMBA_AVAILABLE:
+        small = actual.size < _SMALL_KERNEL_SIZE and dtype == np.float64
+        kernel = _all_metrics_kernel_small if small else _all_metrics_kernel
+        mape, wape, mae, rmse, bias, smape, mse = kernel(actual, forecast)
+        return {
+            'mape': mape,
+            'wape': wape,
+            'mae': mae,
+            'rmse': rmse,
+            'bias': bias,
+            'smape': smape,
+            'mse': mse
+        }
+    
+    # Derive every metric from three shared buffers instead of re-reading the inputs per metric
+    diff = actual - forecast
+    abs_diff = np.abs(diff)
+    sq = diff * diff
+    abs_actual = np.abs(actual)
+    
+    ratio = np.zeros_like(abs_diff)
+    mask = actual != 0
+    np.divide(abs_diff, abs_actual, out=ratio, where=mask)
+    mape = ratio.sum(dtype=np.float64) / mask.sum() * 100
+    
+    denominator = (abs_actual + np.abs(forecast)) / 2
+    smape_mask = denominator != 0
+    ratio.fill(0)
+    np.divide(abs_diff, denominator, out=ratio, where=smape_mask)
+    smape = ratio.sum(dtype=np.float64) / smape_mask.sum() * 100
+    
+    mse = sq.mean(dtype=np.float64)
     return {
-        'mape': calculate_mape(actual, forecast),
-        'wape': calculate_wape(actual, forecast),
-        'mae': calculate_mae(actual, forecast),
-        'rmse': calculate_rmse(actual, forecast),
-        'bias': calculate_bias(actual, forecast),
-        'smape': calculate_smape(actual, forecast),
-        'mse': np.mean((actual - forecast) ** 2)
+        'mape': mape,
+        'wape': abs_diff.sum(dtype=np.float64) / abs_actual.sum(dtype=np.float64) * 100,
+        'mae': abs_diff.mean(dtype=np.float64),
+        'rmse': np.sqrt(mse),
+        'bias': -diff.mean(dtype=np.float64),
+        'smape': smape,
+        'mse': mse
+    }
+
+
+def calculate_all_accuracy_metrics_batch(actual: np.ndarray, forecast: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate all accuracy metrics for many series at once
+    
+    Args:
+        actual: 2-D array of actual values, one series (e.g. SKU) per row
+        forecast: 2-D array of forecasted values with the same shape
+        
+    Returns:
+        Dictionary mapping each metric name to an array with one value per row
+    """
+    actual = np.atleast_2d(np.asarray(actual, dtype=np.float64))
+    forecast = np.atleast_2d(np.asarray(forecast, dtype=np.float64))
+    diff = actual - forecast
+    abs_diff = np.abs(diff)
+    sq = diff * diff
+    abs_actual = np.abs(actual)
+    
+    ratio = np.zeros_like(abs_diff)
+    mask = actual != 0
+    np.divide(abs_diff, abs_actual, out=ratio, where=mask)
+    mape = ratio.sum(axis=1) / mask.sum(axis=1) * 100
+    
+    denominator = (abs_actual + np.abs(forecast)) / 2
+    smape_mask = denominator != 0
+    ratio.fill(0)
+    np.divide(abs_diff, denominator, out=ratio, where=smape_mask)
+    smape = ratio.sum(axis=1) / smape_mask.sum(axis=1) * 100
+    
+    mse = sq.mean(axis=1)
+    return {
+        'mape': mape,
+        'wape': abs_diff.sum(axis=1) / abs_actual.sum(axis=1) * 100,
+        'mae': abs_diff.mean(axis=1),
+        'rmse': np.sqrt(mse),
+        'bias': -diff.mean(axis=1),
+        'smape': smape,
+        'mse': mse
     }
 
 
@@ -137,18 +438,29 @@ def calculate_confidence_interval_frequentist(
     Returns:
         Tuple of (lower_bound, upper_bound)
     """
+    data = np.ascontiguousarray(data, dtype=np.float64)
     n = len(data)
-    mean = np.mean(data)
-    std_err = stats.sem(data)
-    interval = std_err * t.ppf((1 + confidence_level) / 2, n - 1)
+    if NUMBA_AVAILABLE:
+        mean, std_err = _mean_sem(data)
+    else:
+        mean = data.mean()
+        std_err = data.std(ddof=1) / np.sqrt(n)
+    interval = std_err * _t_quantile(confidence_level, n - 1)
     
     return mean - interval, mean + interval
 
 
+@lru_cache(maxsize=4096)
+def _t_quantile(confidence_level: float, df: int) -> float:
+    """Two-sided Student's t quantile, memoised across calls with the same level and df"""
+    return float(t.ppf((1 + confidence_level) / 2, df))
+
+
 def calculate_confidence_interval_bootstrap(
     data: np.ndarray, 
     confidence_level: float = 0.95,
-    n_bootstrap: int = 1000
+    n_bootstrap: int = 1000,
+    n_jobs: Optional[int] = None
 ) -> Tuple[float, float]:
     """
     Calculate bootstrap confidence interval
@@ -157,22 +469,68 @@ def calculate_confidence_interval_bootstrap(
         data: Array of data points
         confidence_level: Confidence level (default 0.95)
         n_bootstrap: Number of bootstrap samples
+        n_jobs: Worker processes for large workloads (default: CPU count - 1)
         
     Returns:
         Tuple of (lower_bound, upper_bound)
     """
-    bootstrap_means = []
-    n = len(data)
-    
-    for _ in range(n_bootstrap):
-        sample = np.random.choice(data, size=n, replace=True)
-        bootstrap_means.append(np.mean(sample))
+    data = np.asarray(data)
+    if n_jobs is None:
+        n_jobs = max(1, (os.cpu_count() or 1) - 1)
+    n_jobs = min(n_jobs, n_bootstrap)
+    
+    if n_jobs > 1 and len(data) * n_bootstrap >= _PARALLEL_BOOTSTRAP_MIN_ELEMENTS:
+        # Independent random streams per worker
+        seeds = np.random.SeedSequence().spawn(n_jobs)
+        shares = np.diff(np.linspace(0, n_bootstrap, n_jobs + 1).astype(int))
+        parts = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_bootstrap_means)(data, int(share), np.random.default_rng(seed))
+            for share, seed in zip(shares, seeds)
+        )
+        bootstrap_means = np.concatenate(parts)
+    else:
+        bootstrap_means = _bootstrap_means(data, n_bootstrap, _RNG)
     
     alpha = 1 - confidence_level
     lower_percentile = (alpha / 2) * 100
     upper_percentile = (1 - alpha / 2) * 100
     
-    return np.percentile(bootstrap_means, [lower_percentile, upper_percentile])
+    return _partition_quantiles(bootstrap_means, [lower_percentile / 100, upper_percentile / 100])
+
+
+def _partition_quantiles(data: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """
+    Linearly interpolated quantiles (np.percentile semantics) from one np.partition
+    
+    Only the order statistics bracketing each quantile are selected, so no
+    full sort of the data is needed.
+    """
+    data = np.asarray(data).ravel()
+    positions = np.asarray(quantiles, dtype=np.float64) * (data.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    
+    part = np.partition(data, np.union1d(lower, upper))
+    return part[lower] + (part[upper] - part[lower]) * (positions - lower)
+
+
+def _bootstrap_means(data: np.ndarray, n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw bootstrap resamples as index matrices and return their means
+    
+    Resamples are processed in blocks so the index matrix stays bounded
+    for large inputs.
+    """
+    n = len(data)
+    means = np.empty(n_resamples)
+    block = max(1, _BOOTSTRAP_BLOCK_ELEMENTS // max(n, 1))
+    
+    for start in range(0, n_resamples, block):
+        stop = min(start + block, n_resamples)
+        idx = rng.integers(0, n, size=(stop - start, n), dtype=np.intp)
+        means[start:stop] = data[idx].mean(axis=1)
+    
+    return means
 
 
 def calculate_prediction_interval(
@@ -199,7 +557,7 @@ def calculate_prediction_interval(
         margin = z_score * std_error
     else:
         # Use t-distribution
-        t_score = t.ppf((1 + confidence_level) / 2, df)
+        t_score = _t_quantile(confidence_level, df)
         margin = t_score * std_error
     
     return forecast - margin, forecast + margin
@@ -216,7 +574,16 @@ def detect_outliers_zscore(data: np.ndarray, threshold: float = 3.0) -> np.ndarr
     Returns:
         Boolean array indicating outliers
     """
-    z_scores = np.abs(stats.zscore(data))
+    data = np.asarray(data, dtype=np.float64)
+    mu = data.mean()
+    sd = data.std()
+    
+    if NUMEXPR_AVAILABLE and data.size >= _NUMEXPR_MIN_SIZE:
+        return numexpr.evaluate("abs((data - mu) / sd) > threshold")
+    
+    z_scores = data - mu
+    np.abs(z_scores, out=z_scores)
+    z_scores /= sd
     return z_scores > threshold
 
 
@@ -231,8 +598,7 @@ def detect_outliers_iqr(data: np.ndarray, k: float = 1.5) -> np.ndarray:
     Returns:
         Boolean array indicating outliers
     """
-    Q1 = np.percentile(data, 25)
-    Q3 = np.percentile(data, 75)
+    Q1, Q3 = _partition_quantiles(data, [0.25, 0.75])
     IQR = Q3 - Q1
     
     lower_bound = Q1 - k * IQR
@@ -257,17 +623,19 @@ def detect_outliers_isolation(data: np.ndarray, contamination: float = 0.1) -> n
         data = data.reshape(-1, 1)
     
     mean = np.mean(data, axis=0)
-    cov = np.cov(data.T)
-    inv_cov = np.linalg.inv(cov) if np.linalg.det(cov) != 0 else np.linalg.pinv(cov)
+    cov = np.atleast_2d(np.cov(data.T))
+    diff = data - mean
     
-    distances = []
-    for point in data:
-        diff = point - mean
-        distance = np.sqrt(diff.T @ inv_cov @ diff)
-        distances.append(distance)
+    try:
+        # d_i = ||L^-1 (x_i - mean)|| with cov = L L^T, avoiding an explicit inverse
+        L = np.linalg.cholesky(cov + 1e-12 * np.eye(cov.shape[0]))
+        distances = np.linalg.norm(solve_triangular(L, diff.T, lower=True), axis=0)
+    except np.linalg.LinAlgError:
+        inv_cov = np.linalg.pinv(cov)
+        distances = np.sqrt(np.sum((diff @ inv_cov) * diff, axis=1))
     
-    threshold = np.percentile(distances, (1 - contamination) * 100)
-    return np.array(distances) > threshold
+    threshold = _partition_quantiles(distances, [1 - contamination])[0]
+    return distances > threshold
 
 
 def time_series_decomposition(
@@ -310,19 +678,27 @@ def estimate_seasonal_period(data: pd.Series) -> int:
     Returns:
         Estimated seasonal period
     """
-    # Use autocorrelation to find seasonal period
-    from statsmodels.tsa.stattools import acf
+    values = np.ascontiguousarray(data, dtype=np.float64)
+    key = (len(values), hash(values.tobytes()))
+    if key in _SEASONAL_PERIOD_CACHE:
+        return _SEASONAL_PERIOD_CACHE[key]
     
-    acf_values = acf(data.dropna(), nlags=min(len(data) // 2, 40))
+    # Use autocorrelation to find seasonal period
+    acf_values = acf(values[~np.isnan(values)], nlags=min(len(values) // 2, 40))
     
-    # Find peaks in ACF
-    peaks = []
-    for i in range(1, len(acf_values) - 1):
-        if acf_values[i] > acf_values[i-1] and acf_values[i] > acf_values[i+1]:
-            peaks.append(i)
+    # Find strict local maxima in ACF
+    a = acf_values
+    is_peak = (a[1:-1] > a[:-2]) & (a[1:-1] > a[2:])
+    peaks = np.flatnonzero(is_peak) + 1
     
     # Return first significant peak as period
-    return peaks[0] if peaks else 12  # Default to 12 for monthly data
+    period = int(peaks[0]) if peaks.size else 12  # Default to 12 for monthly data
+    
+    if len(_SEASONAL_PERIOD_CACHE) >= _SEASONAL_PERIOD_CACHE_SIZE:
+        del _SEASONAL_PERIOD_CACHE[next(iter(_SEASONAL_PERIOD_CACHE))]
+    _SEASONAL_PERIOD_CACHE[key] = period
+    
+    return period
 
 
 def calculate_seasonality_strength(seasonal: pd.Series, residual: pd.Series) -> float:
@@ -336,8 +712,11 @@ def calculate_seasonality_strength(seasonal: pd.Series, residual: pd.Series) ->
     Returns:
         Seasonality strength (0-1)
     """
-    var_seasonal = np.var(seasonal.dropna())
-    var_residual = np.var(residual.dropna())
+    s = np.asarray(seasonal, dtype=np.float64)
+    r = np.asarray(residual, dtype=np.float64)
+    valid = ~(np.isnan(s) | np.isnan(r))
+    var_seasonal = s[valid].var()
+    var_residual = r[valid].var()
     
     if var_seasonal + var_residual == 0:
         return 0.0
@@ -356,10 +735,14 @@ def calculate_trend_strength(trend: pd.Series, residual: pd.Series) -> float:
     Returns:
         Trend strength (0-1)
     """
+    tr = np.asarray(trend, dtype=np.float64)
+    r = np.asarray(residual, dtype=np.float64)
+    valid = ~(np.isnan(tr) | np.isnan(r))
+    r = r[valid]
+    
     # Detrend the series
-    detrended = trend.dropna() + residual.dropna()
-    var_detrended = np.var(detrended)
-    var_residual = np.var(residual.dropna())
+    var_detrended = (tr[valid] + r).var()
+    var_residual = r.var()
     
     if var_detrended == 0:
         return 0.0
@@ -377,11 +760,13 @@ def test_stationarity(data: pd.Series) -> Dict[str, Union[bool, float]]:
     Returns:
         Dictionary with test results
     """
+    clean = data.dropna().to_numpy()
+    
     # Augmented Dickey-Fuller test
-    adf_result = adfuller(data.dropna())
+    adf_result = adfuller(clean)
     
     # KPSS test
-    kpss_result = kpss(data.dropna())
+    kpss_result = kpss(clean)
     
     return {
         'adf_statistic': adf_result[0],
@@ -394,6 +779,23 @@ def test_stationarity(data: pd.Series) -> Dict[str, Union[bool, float]]:
     }
 
 
+def test_stationarity_batch(
+    series_list: List[pd.Series],
+    n_jobs: int = -1
+) -> List[Dict[str, Union[bool, float]]]:
+    """
+    Run test_stationarity over many series in parallel
+    
+    Args:
+        series_list: Time series to test
+        n_jobs: Number of parallel workers (-1 uses all cores)
+        
+    Returns:
+        List of test results in the same order as series_list
+    """
+    return Parallel(n_jobs=n_jobs)(delayed(test_stationarity)(series) for series in series_list)
+
+
 def calculate_forecast_intervals(
     point_forecasts: np.ndarray,
     residuals: np.ndarray,
@@ -410,19 +812,22 @@ def calculate_forecast_intervals(
     Returns:
         Dictionary mapping confidence level to (lower, upper) bounds
     """
+    point_forecasts = np.asarray(point_forecasts)
     std_error = np.std(residuals)
-    intervals = {}
-    
-    for level in confidence_levels:
-        z_score = norm.ppf((1 + level) / 2)
-        margin = z_score * std_error
-        
-        lower = point_forecasts - margin
-        upper = point_forecasts + margin
-        
-        intervals[level] = (lower, upper)
+    margins = _normal_quantiles(tuple(confidence_levels)) * std_error
     
-    return intervals
+    return {
+        level: (point_forecasts - margin, point_forecasts + margin)
+        for level, margin in zip(confidence_levels, margins)
+    }
+
+
+@lru_cache(maxsize=128)
+def _normal_quantiles(confidence_levels: Tuple[float, ...]) -> np.ndarray:
+    """Two-sided normal quantiles for a tuple of confidence levels"""
+    z_scores = norm.ppf((1 + np.asarray(confidence_levels)) / 2)
+    z_scores.setflags(write=False)
+    return z_scores
 
 
 def calculate_volatility(data: np.ndarray, method: str = 'std') -> float:
@@ -441,6 +846,9 @@ def calculate_volatility(data: np.ndarray, method: str = 'std') -> float:
     elif method == 'ewma':
         # Exponentially weighted moving average volatility
         returns = np.diff(data) / data[:-1]
+        if NUMBA_AVAILABLE:
+            # span=20 -> alpha = 2 / (span + 1); only the last variance is needed
+            return np.sqrt(_ewma_var_last(np.ascontiguousarray(returns, dtype=np.float64), 2.0 / 21.0))
         ewma_var = pd.Series(returns).ewm(span=20).var()
         return np.sqrt(ewma_var.iloc[-1])
     else:
@@ -450,32 +858,37 @@ def calculate_volatility(data: np.ndarray, method: str = 'std') -> float:
 
 def calculate_information_criteria(
     residuals: np.ndarray,
-    n_params: int
-) -> Dict[str, float]:
+    n_params: Union[int, np.ndarray]
+) -> Dict[str, Union[float, np.ndarray]]:
     """
     Calculate information criteria for model selection
     
     Args:
-        residuals: Model residuals
-        n_params: Number of model parameters
+        residuals: Model residuals, or a 2-D array with one candidate model per row
+        n_params: Number of model parameters (scalar or one per candidate)
         
     Returns:
-        Dictionary with AIC, BIC, and HQIC values
+        Dictionary with AIC, BIC, and HQIC values (arrays for 2-D residuals)
     """
-    n = len(residuals)
-    sse = np.sum(residuals ** 2)
+    residuals = np.asarray(residuals)
+    n = residuals.shape[-1]
+    sse = np.sum(residuals * residuals, axis=-1)
+    
+    # Shared log-likelihood term and log(n)
+    log_likelihood = n * np.log(sse / n)
+    log_n = np.log(n)
     
     # Akaike Information Criterion
-    aic = n * np.log(sse / n) + 2 * n_params
+    aic = log_likelihood + 2 * n_params
     
     # Bayesian Information Criterion
-    bic = n * np.log(sse / n) + n_params * np.log(n)
+    bic = log_likelihood + n_params * log_n
     
     # Hannan-Quinn Information Criterion
-    hqic = n * np.log(sse / n) + 2 * n_params * np.log(np.log(n))
+    hqic = log_likelihood + 2 * n_params * np.log(log_n)
     
     return {
         'aic': aic,
         'bic': bic,
         'hqic': hqic
-    }
\ No newline at end of file
+    }
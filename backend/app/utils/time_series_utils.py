@@ -3,23 +3,82 @@ Time Series Analysis Utilities
 Advanced time series processing and analysis methods
 """
 
+from functools import cached_property, lru_cache
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.metrics import silhouette_score
 import warnings
 from scipy import signal
-from scipy.interpolate import interp1d
+from scipy.interpolate import CubicSpline
+from joblib import Parallel, delayed
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; change-point scan falls back to Python
+    NUMBA_AVAILABLE = False
+
+# Windows whose running-sum variance falls within this fraction of their mean square are
+# recomputed exactly; cancellation leaves the running-sum value meaningless there
+VARIANCE_RTOL = 1e-6
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _cp_detect(cumsum, min_length, threshold):
+        """Scan a CUSUM path for spaced local maxima of deviation from its chord"""
+        n = cumsum.size
+        start = cumsum[0]
+        span = cumsum[-1] - cumsum[0]
+        denom = n - 1
+        out = np.empty(n, dtype=np.int64)
+        count = 0
+        
+        for i in range(min_length, n - min_length):
+            deviation = abs(cumsum[i] - (start + span * i / denom))
+            if deviation <= threshold:
+                continue
+            
+            local_max = True
+            for j in range(max(0, i - 3), min(n, i + 4)):
+                if j != i and abs(cumsum[j] - (start + span * j / denom)) > deviation:
+                    local_max = False
+                    break
+            
+            if local_max and (count == 0 or i - out[count - 1] >= min_length):
+                out[count] = i
+                count += 1
+        
+        return out[:count]
+
+@lru_cache(maxsize=32)
+def _iota(n: int) -> np.ndarray:
+    """Read-only index vector 0..n-1, shared across calls of the same length"""
+    x = np.arange(n)
+    x.setflags(write=False)
+    return x
 
 class TimeSeriesAnalyzer:
     """Advanced time series analysis and processing utilities"""
     
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.min_max_scaler = MinMaxScaler()
+    # Per-series entry points that analyze_batch may dispatch to
+    BATCH_METHODS = ('calculate_stability_index', 'classify_lifecycle_stage', 'detect_change_points')
+    
+    @cached_property
+    def scaler(self):
+        """Standard scaler, created on first use"""
+        from sklearn.preprocessing import StandardScaler
+        return StandardScaler()
+    
+    @cached_property
+    def min_max_scaler(self):
+        """Min-max scaler, created on first use"""
+        from sklearn.preprocessing import MinMaxScaler
+        return MinMaxScaler()
         
     def calculate_stability_index(self, 
                                  data: np.ndarray, 
@@ -35,6 +94,9 @@ class TimeSeriesAnalyzer:
             Dictionary with stability metrics
         """
         try:
+            # Running-sum rolling stats cancel on near-constant windows; keep float64 input
+            data = np.ascontiguousarray(data, dtype=np.float64)
+            
             if len(data) < window_size * 2:
                 return {
                     'stability_index': 0.0,
@@ -44,45 +106,7 @@ class TimeSeriesAnalyzer:
                     'error': 'Insufficient data for stability analysis'
                 }
             
-            # Calculate rolling statistics
-            rolling_mean = self._rolling_window_stats(data, window_size, 'mean')
-            rolling_std = self._rolling_window_stats(data, window_size, 'std')
-            
-            # Coefficient of variation for each window
-            cv_values = rolling_std / rolling_mean
-            cv_values = cv_values[~np.isnan(cv_values)]
-            
-            if len(cv_values) == 0:
-                return {
-                    'stability_index': 0.0,
-                    'stability_level': 'no_valid_windows',
-                    'volatility_score': 1.0,
-                    'trend_consistency': 0.0
-                }
-            
-            # Stability metrics
-            mean_cv = np.mean(cv_values)
-            cv_consistency = 1.0 - np.std(cv_values)  # Lower std = more consistent
-            
-            # Trend consistency (measure how consistent the direction changes are)
-            trend_consistency = self._calculate_trend_consistency(data, window_size)
-            
-            # Overall stability index (0-1, higher is more stable)
-            volatility_penalty = min(mean_cv, 2.0) / 2.0  # Normalize CV
-            stability_index = max(0.0, 1.0 - volatility_penalty) * cv_consistency * trend_consistency
-            
-            # Classify stability level
-            stability_level = self._classify_stability_level(stability_index)
-            
-            return {
-                'stability_index': float(stability_index),
-                'stability_level': stability_level,
-                'volatility_score': float(mean_cv),
-                'cv_consistency': float(cv_consistency),
-                'trend_consistency': float(trend_consistency),
-                'rolling_cv_mean': float(mean_cv),
-                'rolling_cv_std': float(np.std(cv_values))
-            }
+            return self._stability_core(data, window_size)
             
         except Exception as e:
             return {
@@ -93,63 +117,145 @@ class TimeSeriesAnalyzer:
                 'error': str(e)
             }
     
+    def _stability_core(self, data: np.ndarray, window_size: int) -> Dict[str, Any]:
+        """Stability metrics for validated input (len(data) >= 2 * window_size)"""
+        # Calculate rolling statistics
+        rolling_mean, rolling_std = self._rolling_mean_std_fast(data, window_size)
+        
+        # Coefficient of variation for each window
+        cv_values = rolling_std / rolling_mean
+        cv_values = cv_values[~np.isnan(cv_values)]
+        
+        if len(cv_values) == 0:
+            return {
+                'stability_index': 0.0,
+                'stability_level': 'no_valid_windows',
+                'volatility_score': 1.0,
+                'trend_consistency': 0.0
+            }
+        
+        # Stability metrics
+        mean_cv = np.mean(cv_values)
+        cv_consistency = 1.0 - np.std(cv_values)  # Lower std = more consistent
+        
+        # Trend consistency (measure how consistent the direction changes are)
+        trend_consistency = self._calculate_trend_consistency(data, window_size)
+        
+        # Overall stability index (0-1, higher is more stable)
+        volatility_penalty = min(mean_cv, 2.0) / 2.0  # Normalize CV
+        stability_index = max(0.0, 1.0 - volatility_penalty) * cv_consistency * trend_consistency
+        
+        # Classify stability level
+        stability_level = self._classify_stability_level(stability_index)
+        
+        return {
+            'stability_index': float(stability_index),
+            'stability_level': stability_level,
+            'volatility_score': float(mean_cv),
+            'cv_consistency': float(cv_consistency),
+            'trend_consistency': float(trend_consistency),
+            'rolling_cv_mean': float(mean_cv),
+            'rolling_cv_std': float(np.std(cv_values))
+        }
+    
     def _rolling_window_stats(self, data: np.ndarray, window_size: int, stat: str) -> np.ndarray:
         """Calculate rolling window statistics"""
-        try:
-            result = np.full(len(data), np.nan)
-            
-            for i in range(window_size - 1, len(data)):
-                window_data = data[i - window_size + 1:i + 1]
-                
-                if stat == 'mean':
-                    result[i] = np.mean(window_data)
-                elif stat == 'std':
-                    result[i] = np.std(window_data, ddof=1)
-                elif stat == 'median':
-                    result[i] = np.median(window_data)
-                elif stat == 'min':
-                    result[i] = np.min(window_data)
-                elif stat == 'max':
-                    result[i] = np.max(window_data)
-            
+        result = np.full(len(data), np.nan)
+        if len(data) < window_size:
             return result
-            
-        except:
-            return np.full(len(data), np.nan)
+        
+        # One row per window; leading window_size - 1 entries stay NaN
+        windows = sliding_window_view(data, window_size)
+        
+        if stat == 'mean':
+            result[window_size - 1:] = windows.mean(axis=1)
+        elif stat == 'std':
+            result[window_size - 1:] = windows.std(axis=1, ddof=1)
+        elif stat == 'median':
+            result[window_size - 1:] = np.median(windows, axis=1)
+        elif stat == 'min':
+            result[window_size - 1:] = windows.min(axis=1)
+        elif stat == 'max':
+            result[window_size - 1:] = windows.max(axis=1)
+        
+        return result
+    
+    def _rolling_mean_std_fast(self, data: np.ndarray, window_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rolling mean and std (ddof=1) in O(N) from running sums; near-constant windows are recomputed exactly"""
+        n = len(data)
+        rolling_mean = np.full(n, np.nan)
+        rolling_std = np.full(n, np.nan)
+        if n < window_size:
+            return rolling_mean, rolling_std
+        
+        if np.isnan(data).any():
+            # Running sums would carry a NaN into every later window
+            return (self._rolling_window_stats(data, window_size, 'mean'),
+                    self._rolling_window_stats(data, window_size, 'std'))
+        
+        # Centre the data first to limit cancellation in the sum-of-squares difference
+        shift = data.mean()
+        centered = data - shift
+        csum = np.concatenate(([0.0], np.cumsum(centered, dtype=np.float64)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(centered * centered, dtype=np.float64)))
+        window_sum = csum[window_size:] - csum[:-window_size]
+        window_sum_sq = csum_sq[window_size:] - csum_sq[:-window_size]
+        
+        means = window_sum / window_size + shift
+        variance = (window_sum_sq - window_sum * window_sum / window_size) / (window_size - 1)
+        
+        # The running-sum difference leaves round-off on (near-)constant windows, e.g. a
+        # std of ~1e-2 and a mean of -4e-16 over a run of zeros; recompute those exactly
+        inexact = variance <= VARIANCE_RTOL * (window_sum_sq / window_size)
+        if inexact.any():
+            windows = sliding_window_view(data, window_size)[inexact]
+            means[inexact] = windows.mean(axis=1)
+            variance[inexact] = windows.var(axis=1, ddof=1)
+        
+        # A window is constant when no adjacent pair inside it differs; counting changes
+        # with a running sum keeps this O(N) like the sums above
+        changes = np.concatenate(([0], np.cumsum(data[1:] != data[:-1])))
+        constant = changes[window_size - 1:] == changes[:n - window_size + 1]
+        means[constant] = data[window_size - 1:][constant]
+        variance[constant] = 0.0
+        
+        rolling_mean[window_size - 1:] = means
+        rolling_std[window_size - 1:] = np.sqrt(variance)
+        return rolling_mean, rolling_std
     
     def _calculate_trend_consistency(self, data: np.ndarray, window_size: int) -> float:
         """Calculate how consistent the trend direction is"""
-        try:
-            if len(data) < window_size * 2:
-                return 0.0
-            
-            # Calculate rolling slopes
-            slopes = []
-            for i in range(window_size, len(data) - window_size):
-                window_data = data[i - window_size:i + window_size]
-                x = np.arange(len(window_data))
-                slope = np.polyfit(x, window_data, 1)[0]
-                slopes.append(slope)
-            
-            if len(slopes) < 2:
-                return 0.0
-            
-            slopes = np.array(slopes)
-            
-            # Count sign changes in slope
-            sign_changes = np.sum(np.diff(np.sign(slopes)) != 0)
-            max_possible_changes = len(slopes) - 1
-            
-            # Consistency is inverse of change frequency
-            if max_possible_changes > 0:
-                consistency = 1.0 - (sign_changes / max_possible_changes)
-            else:
-                consistency = 1.0
-            
-            return max(0.0, consistency)
-            
-        except:
+        if len(data) < window_size * 2:
+            return 0.0
+        
+        # Calculate rolling slopes over windows data[i - W:i + W] for i in [W, n - W)
+        span = window_size * 2
+        n_windows = len(data) - span
+        if n_windows < 2:
             return 0.0
+        
+        # Closed-form OLS slope: sum(y * (x - x_mean)) / Sxx, with x = 0..span-1 shared by every window
+        x_centered = _iota(span) - (span - 1) / 2.0
+        sxx = np.dot(x_centered, x_centered)
+        windows = sliding_window_view(data, span)[:n_windows]
+        slopes = windows @ x_centered.astype(data.dtype, copy=False) / sxx
+        
+        if not np.all(np.isfinite(slopes)):
+            # Matches the previous behaviour when a window fit failed
+            return 0.0
+        
+        # Count sign changes in slope
+        signs = np.sign(slopes).astype(np.int8)
+        sign_changes = np.count_nonzero(signs[1:] != signs[:-1])
+        max_possible_changes = len(slopes) - 1
+        
+        # Consistency is inverse of change frequency
+        if max_possible_changes > 0:
+            consistency = 1.0 - (sign_changes / max_possible_changes)
+        else:
+            consistency = 1.0
+        
+        return max(0.0, consistency)
     
     def _classify_stability_level(self, stability_index: float) -> str:
         """Classify stability index into levels"""
@@ -178,6 +284,9 @@ class TimeSeriesAnalyzer:
             Dictionary with lifecycle classification
         """
         try:
+            # Single precision halves memory traffic; reductions accumulate in float64
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            
             if len(data) < 10:
                 return {
                     'lifecycle_stage': 'insufficient_data',
@@ -210,62 +319,54 @@ class TimeSeriesAnalyzer:
     
     def _calculate_lifecycle_metrics(self, data: np.ndarray) -> Dict[str, float]:
         """Calculate metrics for lifecycle classification"""
-        try:
-            # Trend analysis
-            x = np.arange(len(data))
-            trend_slope = np.polyfit(x, data, 1)[0]
-            
-            # Growth rate calculation
-            if len(data) >= 4:
-                first_quarter = np.mean(data[:len(data)//4])
-                last_quarter = np.mean(data[-len(data)//4:])
-                growth_rate = (last_quarter - first_quarter) / first_quarter if first_quarter > 0 else 0.0
-            else:
-                growth_rate = 0.0
-            
-            # Variance and stability
-            variance = np.var(data, ddof=1)
-            cv = np.std(data, ddof=1) / np.mean(data) if np.mean(data) > 0 else 0.0
-            
-            # Peak detection
-            from scipy.signal import find_peaks
-            peaks, _ = find_peaks(data, height=np.mean(data))
-            peak_frequency = len(peaks) / len(data)
-            
-            # Volume characteristics
-            mean_volume = np.mean(data)
-            max_volume = np.max(data)
-            volume_ratio = mean_volume / max_volume if max_volume > 0 else 0.0
-            
-            # Acceleration (second derivative)
-            if len(data) >= 3:
-                acceleration = np.mean(np.diff(data, n=2))
-            else:
-                acceleration = 0.0
-            
-            return {
-                'trend_slope': float(trend_slope),
-                'growth_rate': float(growth_rate),
-                'variance': float(variance),
-                'coefficient_of_variation': float(cv),
-                'peak_frequency': float(peak_frequency),
-                'mean_volume': float(mean_volume),
-                'volume_ratio': float(volume_ratio),
-                'acceleration': float(acceleration)
-            }
-            
-        except Exception as e:
-            return {
-                'trend_slope': 0.0,
-                'growth_rate': 0.0,
-                'variance': 0.0,
-                'coefficient_of_variation': 0.0,
-                'peak_frequency': 0.0,
-                'mean_volume': 0.0,
-                'volume_ratio': 0.0,
-                'acceleration': 0.0,
-                'error': str(e)
-            }
+        # Shared accumulators reused by the metrics below
+        n = len(data)
+        data_sum = data.sum(dtype=np.float64)
+        mean_volume = data_sum / n
+        
+        # Trend analysis: closed-form OLS slope against x = 0..n-1
+        x = _iota(n)
+        trend_slope = (np.dot(x, data) - (n - 1) / 2.0 * data_sum) / (n * (n * n - 1) / 12.0)
+        
+        # Growth rate calculation
+        if n >= 4:
+            first_quarter = np.mean(data[:n//4], dtype=np.float64)
+            last_quarter = np.mean(data[-n//4:], dtype=np.float64)
+            growth_rate = (last_quarter - first_quarter) / first_quarter if first_quarter > 0 else 0.0
+        else:
+            growth_rate = 0.0
+        
+        # Variance and stability from the sum / sum-of-squares accumulators
+        variance = max((np.einsum('i,i->', data, data, dtype=np.float64) - data_sum * mean_volume) / (n - 1), 0.0)
+        cv = np.sqrt(variance) / mean_volume if mean_volume > 0 else 0.0
+        
+        # Peak detection: strict local maxima above the mean, with flat tops
+        # collapsed to one sample so plateaus count once (as in find_peaks)
+        runs = data[np.r_[True, data[1:] != data[:-1]]]
+        middle = runs[1:-1]
+        peak_mask = (middle > runs[:-2]) & (middle > runs[2:]) & (middle >= mean_volume)
+        peak_frequency = np.count_nonzero(peak_mask) / n
+        
+        # Volume characteristics
+        max_volume = data.max()
+        volume_ratio = mean_volume / max_volume if max_volume > 0 else 0.0
+        
+        # Acceleration (second derivative); the mean of second differences telescopes
+        if n >= 3:
+            acceleration = (data[-1] - data[-2] - data[1] + data[0]) / (n - 2)
+        else:
+            acceleration = 0.0
+        
+        return {
+            'trend_slope': float(trend_slope),
+            'growth_rate': float(growth_rate),
+            'variance': float(variance),
+            'coefficient_of_variation': float(cv),
+            'peak_frequency': float(peak_frequency),
+            'mean_volume': float(mean_volume),
+            'volume_ratio': float(volume_ratio),
+            'acceleration': float(acceleration)
+        }
     
     def _apply_lifecycle_rules(self, metrics: Dict[str, float]) -> Tuple[str, float, str]:
         """Apply business rules for lifecycle classification"""
@@ -343,18 +444,23 @@ class TimeSeriesAnalyzer:
     
     def detect_change_points(self, 
                            data: np.ndarray, 
-                           min_segment_length: int = 5) -> Dict[str, Any]:
+                           min_segment_length: int = 5,
+                           serialize: bool = False) -> Dict[str, Any]:
         """
         Detect structural change points in time series
         
         Args:
             data: Time series data
             min_segment_length: Minimum length of segments
+            serialize: Return each segment's data as raw float32 bytes instead of an array
             
         Returns:
             Dictionary with change point detection results
         """
         try:
+            # Float32 rounding can move CUSUM maxima across the threshold; keep float64 input
+            data = np.ascontiguousarray(data, dtype=np.float64)
+            
             if len(data) < min_segment_length * 2:
                 return {
                     'change_points': [],
@@ -367,7 +473,7 @@ class TimeSeriesAnalyzer:
             change_points = self._cumsum_change_point_detection(data, min_segment_length)
             
             # Create segments based on change points
-            segments = self._create_segments(data, change_points)
+            segments = self._create_segments(data, change_points, serialize)
             
             return {
                 'change_points': change_points,
@@ -386,95 +492,96 @@ class TimeSeriesAnalyzer:
     
     def _cumsum_change_point_detection(self, data: np.ndarray, min_length: int) -> List[int]:
         """Detect change points using cumulative sum method"""
-        try:
-            # Normalize data
-            normalized_data = (data - np.mean(data)) / np.std(data)
-            
-            # Calculate cumulative sum
-            cumsum = np.cumsum(normalized_data)
-            
-            # Find potential change points
-            change_points = []
-            
-            for i in range(min_length, len(data) - min_length):
-                # Calculate deviation from linear trend
-                expected = cumsum[0] + (cumsum[-1] - cumsum[0]) * i / (len(data) - 1)
-                deviation = abs(cumsum[i] - expected)
-                
-                # Threshold for change point detection
-                threshold = 2.0 * np.std(cumsum)
-                
-                if deviation > threshold:
-                    # Check if this is a local maximum in deviation
-                    local_max = True
-                    for j in range(max(0, i - 3), min(len(data), i + 4)):
-                        if j != i:
-                            expected_j = cumsum[0] + (cumsum[-1] - cumsum[0]) * j / (len(data) - 1)
-                            deviation_j = abs(cumsum[j] - expected_j)
-                            if deviation_j > deviation:
-                                local_max = False
-                                break
-                    
-                    if local_max:
-                        change_points.append(i)
-            
-            # Remove change points that are too close to each other
-            filtered_change_points = []
-            for cp in change_points:
-                if not filtered_change_points or cp - filtered_change_points[-1] >= min_length:
-                    filtered_change_points.append(cp)
-            
-            return filtered_change_points
-            
-        except:
+        # Normalize data
+        normalized_data = (data - np.mean(data)) / np.std(data)
+        
+        # Calculate cumulative sum
+        cumsum = np.cumsum(normalized_data, dtype=np.float64)
+        
+        # Threshold for change point detection
+        threshold = 2.0 * np.std(cumsum)
+        if not np.isfinite(threshold):
             return []
+        
+        if NUMBA_AVAILABLE:
+            return _cp_detect(cumsum, min_length, threshold).tolist()
+        
+        # Deviation of the cumulative sum from its end-to-end chord, computed once
+        n = len(data)
+        expected = cumsum[0] + (cumsum[-1] - cumsum[0]) * _iota(n) / (n - 1)
+        deviation = np.abs(cumsum - expected)
+        
+        # Points not exceeded by any neighbour within 3 steps, above threshold and away from the edges
+        candidates = signal.argrelextrema(deviation, np.greater_equal, order=3)[0]
+        change_points = candidates[(deviation[candidates] > threshold) &
+                                   (candidates >= min_length) &
+                                   (candidates < n - min_length)].tolist()
+        
+        # Remove change points that are too close to each other
+        filtered_change_points = []
+        for cp in change_points:
+            if not filtered_change_points or cp - filtered_change_points[-1] >= min_length:
+                filtered_change_points.append(cp)
+        
+        return filtered_change_points
     
-    def _create_segments(self, data: np.ndarray, change_points: List[int]) -> List[Dict[str, Any]]:
-        """Create segments based on change points"""
-        try:
-            segments = []
-            start_indices = [0] + change_points
-            end_indices = change_points + [len(data) - 1]
-            
-            for i, (start, end) in enumerate(zip(start_indices, end_indices)):
-                segment_data = data[start:end + 1]
-                
-                segments.append({
-                    'segment_id': i,
-                    'start_index': start,
-                    'end_index': end,
-                    'length': len(segment_data),
-                    'data': segment_data.tolist(),
-                    'mean': float(np.mean(segment_data)),
-                    'std': float(np.std(segment_data, ddof=1)) if len(segment_data) > 1 else 0.0,
-                    'trend': float(np.polyfit(range(len(segment_data)), segment_data, 1)[0]) if len(segment_data) > 1 else 0.0
-                })
-            
-            return segments
-            
-        except:
-            return []
+    def _create_segments(self,
+                         data: np.ndarray,
+                         change_points: List[int],
+                         serialize: bool = False) -> List[Dict[str, Any]]:
+        """Create segments based on change points; segment data is kept as float32 (bytes if serialize)"""
+        segments = []
+        start_indices = [0] + change_points
+        end_indices = change_points + [len(data) - 1]
+        
+        for i, (start, end) in enumerate(zip(start_indices, end_indices)):
+            segment_data = data[start:end + 1]
+            segment_data_f32 = segment_data.astype(np.float32, copy=False)
+            length = len(segment_data)
+            mean = segment_data.mean(dtype=np.float64)
+            
+            # Std and closed-form OLS slope share the centred deviations
+            if length > 1:
+                centred = segment_data - mean
+                x_centred = _iota(length) - (length - 1) / 2.0
+                std = float(np.sqrt(np.dot(centred, centred) / (length - 1)))
+                trend = float(np.dot(x_centred, centred) / (length * (length * length - 1) / 12.0))
+            else:
+                std = 0.0
+                trend = 0.0
+            
+            segments.append({
+                'segment_id': i,
+                'start_index': start,
+                'end_index': end,
+                'length': length,
+                'data': segment_data_f32.tobytes() if serialize else segment_data_f32,
+                'mean': float(mean),
+                'std': std,
+                'trend': trend
+            })
+        
+        return segments
     
     def _calculate_segment_statistics(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate statistics for segments"""
-        try:
-            if not segments:
-                return {}
-            
-            segment_lengths = [seg['length'] for seg in segments]
-            segment_means = [seg['mean'] for seg in segments]
-            segment_trends = [seg['trend'] for seg in segments]
-            
-            return {
-                'average_segment_length': float(np.mean(segment_lengths)),
-                'segment_length_std': float(np.std(segment_lengths)),
-                'mean_level_changes': float(np.std(segment_means)),
-                'trend_variability': float(np.std(segment_trends)),
-                'total_segments': len(segments)
-            }
-            
-        except:
+        if not segments:
             return {}
+        
+        # One (length, mean, trend) row per segment, reduced column-wise
+        table = np.empty((len(segments), 3))
+        for i, seg in enumerate(segments):
+            table[i] = (seg['length'], seg['mean'], seg['trend'])
+        
+        column_std = table.std(axis=0)
+        
+        return {
+            'average_segment_length': float(table[:, 0].mean()),
+            'segment_length_std': float(column_std[0]),
+            'mean_level_changes': float(column_std[1]),
+            'trend_variability': float(column_std[2]),
+            'total_segments': len(segments)
+        }
     
     def calculate_forecast_revision_metrics(self, 
                                           forecast_history: List[np.ndarray]) -> Dict[str, Any]:
@@ -497,24 +604,33 @@ class TimeSeriesAnalyzer:
                 }
             
             # Calculate revisions between consecutive forecasts
-            revisions = []
-            for i in range(1, len(forecast_history)):
-                current = forecast_history[i]
-                previous = forecast_history[i-1]
+            n_revisions = len(forecast_history) - 1
+            if len({len(forecast) for forecast in forecast_history}) == 1:
+                # Equal horizons: difference the stacked (K, H) history in one call
+                all_revisions = np.diff(np.asarray(forecast_history), axis=0).ravel()
+            else:
+                revisions = []
+                for i in range(1, len(forecast_history)):
+                    current = forecast_history[i]
+                    previous = forecast_history[i-1]
+                    
+                    # Ensure same length for comparison
+                    min_length = min(len(current), len(previous))
+                    revision = current[:min_length] - previous[:min_length]
+                    revisions.append(revision)
                 
-                # Ensure same length for comparison
-                min_length = min(len(current), len(previous))
-                revision = current[:min_length] - previous[:min_length]
-                revisions.append(revision)
-            
-            # Combine all revisions
-            all_revisions = np.concatenate(revisions)
+                # Combine all revisions
+                all_revisions = np.concatenate(revisions)
             
             # Calculate metrics
-            revision_frequency = len(revisions) / len(forecast_history)
-            mean_absolute_revision = np.mean(np.abs(all_revisions))
+            revision_frequency = n_revisions / len(forecast_history)
+            abs_revisions = np.abs(all_revisions)
+            mean_absolute_revision = abs_revisions.mean()
             revision_volatility = np.std(all_revisions, ddof=1)
             
+            # All order statistics of the revision magnitudes in one call
+            q_min, q_median, q75, q95, q_max = np.percentile(abs_revisions, [0, 50, 75, 95, 100])
+            
             # Revision consistency (lower is more consistent)
             revision_consistency = 1.0 / (1.0 + revision_volatility)
             
@@ -523,13 +639,13 @@ class TimeSeriesAnalyzer:
                 'mean_absolute_revision': float(mean_absolute_revision),
                 'revision_volatility': float(revision_volatility),
                 'revision_consistency': float(revision_consistency),
-                'total_revisions': len(revisions),
+                'total_revisions': n_revisions,
                 'revision_magnitude_distribution': {
-                    'min': float(np.min(np.abs(all_revisions))),
-                    'max': float(np.max(np.abs(all_revisions))),
-                    'median': float(np.median(np.abs(all_revisions))),
-                    'q75': float(np.percentile(np.abs(all_revisions), 75)),
-                    'q95': float(np.percentile(np.abs(all_revisions), 95))
+                    'min': float(q_min),
+                    'max': float(q_max),
+                    'median': float(q_median),
+                    'q75': float(q75),
+                    'q95': float(q95)
                 }
             }
             
@@ -570,20 +686,29 @@ class TimeSeriesAnalyzer:
             
             # Create interpolation function
             if method == 'linear':
-                interp_func = interp1d(valid_x, valid_y, kind='linear', 
-                                     bounds_error=False, fill_value='extrapolate')
+                head_slope = (valid_y[1] - valid_y[0]) / (valid_x[1] - valid_x[0])
+                tail_slope = (valid_y[-1] - valid_y[-2]) / (valid_x[-1] - valid_x[-2])
+                
+                def interp_func(x):
+                    # np.interp clamps outside the valid range; extend the end
+                    # segments to keep interp1d's linear extrapolation
+                    values = np.interp(x, valid_x, valid_y)
+                    head = x < valid_x[0]
+                    tail = x > valid_x[-1]
+                    values[head] = valid_y[0] + (x[head] - valid_x[0]) * head_slope
+                    values[tail] = valid_y[-1] + (x[tail] - valid_x[-1]) * tail_slope
+                    return values
             elif method == 'polynomial':
                 degree = min(3, len(valid_y) - 1)
                 poly_coeffs = np.polyfit(valid_x, valid_y, degree)
                 interp_func = lambda x: np.polyval(poly_coeffs, x)
             elif method == 'spline':
-                interp_func = interp1d(valid_x, valid_y, kind='cubic', 
-                                     bounds_error=False, fill_value='extrapolate')
+                interp_func = CubicSpline(valid_x, valid_y, extrapolate=True)
             else:
                 raise ValueError(f"Unknown interpolation method: {method}")
             
             # Interpolate missing values
-            all_indices = np.arange(len(data))
+            all_indices = _iota(len(data))
             interpolated = data.copy()
             missing_indices = np.isnan(data)
             
@@ -594,4 +719,32 @@ class TimeSeriesAnalyzer:
             
         except Exception as e:
             # Fallback: use mean imputation
-            return np.where(np.isnan(data), np.nanmean(data), data)
\ No newline at end of file
+            return np.where(np.isnan(data), np.nanmean(data), data)
+    
+    def analyze_batch(self, 
+                      series_dict: Dict[str, np.ndarray], 
+                      method: str, 
+                      n_jobs: int = -1) -> Dict[str, Dict[str, Any]]:
+        """
+        Apply a per-series analysis method across many series in parallel
+        
+        Args:
+            series_dict: Mapping of series identifier (e.g. SKU) to time series data
+            method: Name of the method to apply, one of BATCH_METHODS
+            n_jobs: Number of parallel workers (-1 uses all cores)
+        
+        Returns:
+            Dictionary mapping each identifier to its result, in input order
+        """
+        if method not in self.BATCH_METHODS:
+            raise ValueError(f"Unknown batch method: {method}")
+        
+        # Dispatch longest series first so they do not straggle at the end
+        keys = sorted(series_dict, key=lambda key: len(series_dict[key]), reverse=True)
+        func = getattr(self, method)
+        results = Parallel(n_jobs=n_jobs, backend='loky', batch_size='auto')(
+            delayed(func)(series_dict[key]) for key in keys
+        )
+        by_key = dict(zip(keys, results))
+        
+        return {key: by_key[key] for key in series_dict}
\ No newline at end of file
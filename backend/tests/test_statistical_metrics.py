@@ -0,0 +1,82 @@
+"""
+Tests for statistical metric utilities
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.statistical_metrics import (
+    _SMALL_KERNEL_SIZE,
+    calculate_all_accuracy_metrics,
+    calculate_mape,
+    calculate_smape,
+)
+
+# One size per kernel: the eager serial build and the parallel build
+KERNEL_SIZES = [_SMALL_KERNEL_SIZE // 2, _SMALL_KERNEL_SIZE * 2]
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(100, 10, n), rng.normal(100, 10, n)
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+@pytest.mark.parametrize('metric', [calculate_mape, calculate_smape, calculate_all_accuracy_metrics])
+def test_mismatched_lengths_raise(metric, n):
+    actual, forecast = _series(n)
+    
+    with pytest.raises(ValueError):
+        metric(actual, forecast[:-n // 4])
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+def test_mismatched_shapes_with_equal_size_raise(n):
+    actual, forecast = _series(n)
+    
+    with pytest.raises(ValueError):
+        calculate_all_accuracy_metrics(actual.reshape(2, -1), forecast.reshape(-1, 2))
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+def test_2d_inputs_match_flattened(n):
+    actual, forecast = _series(n)
+    
+    assert calculate_mape(actual.reshape(2, -1), forecast.reshape(2, -1)) == pytest.approx(
+        calculate_mape(actual, forecast))
+    assert calculate_smape(actual.reshape(2, -1), forecast.reshape(2, -1)) == pytest.approx(
+        calculate_smape(actual, forecast))
+    
+    metrics_2d = calculate_all_accuracy_metrics(actual.reshape(2, -1), forecast.reshape(2, -1))
+    metrics_1d = calculate_all_accuracy_metrics(actual, forecast)
+    for name, value in metrics_1d.items():
+        assert metrics_2d[name] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+def test_mape_matches_numpy(n):
+    actual, forecast = _series(n)
+    actual[::7] = 0.0
+    mask = actual != 0
+    expected = np.mean(np.abs((actual[mask] - forecast[mask]) / actual[mask])) * 100
+    
+    assert calculate_mape(actual, forecast) == pytest.approx(expected)
+    assert calculate_all_accuracy_metrics(actual, forecast)['mape'] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+def test_mape_propagates_nan(n):
+    actual, forecast = _series(n)
+    actual[n // 2] = np.nan
+    
+    assert np.isnan(calculate_mape(actual, forecast))
+    assert np.isnan(calculate_all_accuracy_metrics(actual, forecast)['mape'])
+
+
+@pytest.mark.parametrize('n', KERNEL_SIZES)
+def test_smape_propagates_nan(n):
+    actual, forecast = _series(n)
+    actual[n // 2] = np.nan
+    
+    assert np.isnan(calculate_smape(actual, forecast))
+    assert np.isnan(calculate_all_accuracy_metrics(actual, forecast)['smape'])
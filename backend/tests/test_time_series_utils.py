@@ -0,0 +1,59 @@
+"""
+Tests for time series analysis utilities
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.time_series_utils import TimeSeriesAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return TimeSeriesAnalyzer()
+
+
+@pytest.fixture
+def intermittent_series():
+    rng = np.random.default_rng(3)
+    data = rng.poisson(20, 132).astype(float)
+    data[10:30] = 0.0
+    data[60:75] = 0.0
+    data[120:] = 0.0
+    return data
+
+
+def test_rolling_mean_std_matches_exact_windows(analyzer, intermittent_series):
+    rolling_mean, rolling_std = analyzer._rolling_mean_std_fast(intermittent_series, 7)
+    
+    np.testing.assert_allclose(rolling_mean, analyzer._rolling_window_stats(intermittent_series, 7, 'mean'),
+                               rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(rolling_std, analyzer._rolling_window_stats(intermittent_series, 7, 'std'),
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_rolling_mean_std_zero_runs_are_exact(analyzer, intermittent_series):
+    rolling_mean, rolling_std = analyzer._rolling_mean_std_fast(intermittent_series, 7)
+    
+    # Windows lying entirely inside a run of zeros
+    for end in [*range(16, 30), *range(66, 75), *range(126, 132)]:
+        assert rolling_mean[end] == 0.0
+        assert rolling_std[end] == 0.0
+
+
+def test_rolling_mean_std_constant_windows(analyzer):
+    data = np.r_[np.full(10, 0.1), np.linspace(1.0, 5.0, 10), np.full(10, 3.3)]
+    rolling_mean, rolling_std = analyzer._rolling_mean_std_fast(data, 5)
+    
+    assert np.all(rolling_std[4:10] == 0.0)
+    assert np.all(rolling_mean[4:10] == 0.1)
+    assert np.all(rolling_std[24:] == 0.0)
+    assert np.all(rolling_mean[24:] == 3.3)
+
+
+def test_stability_index_finite_with_zero_runs(analyzer, intermittent_series):
+    result = analyzer.calculate_stability_index(intermittent_series)
+    
+    assert 'error' not in result
+    assert np.isfinite(result['stability_index'])
+    assert np.isfinite(result['volatility_score'])
@@ -11,17 +11,144 @@ from awsglue.dynamicframe import DynamicFrame
 # Get job parameters
 args = getResolvedOptions(sys.argv, ['JOB_NAME', 'BUCKET_NAME', 'DATABASE_NAME'])
 
+# Optional job parameters:
+#   --RAW_FORMAT parquet   read raw data from the raw_<source> Parquet catalog tables instead of CSV
+#   --INGEST_SINCE <date>  with Parquet input, only scan ingest_date partitions on or after this date
+#   --CONVERT_RAW true     one-off: rewrite the raw CSV landing zone to Parquet partitioned by ingest_date
+for optional_arg, default in [('RAW_FORMAT', 'csv'), ('INGEST_SINCE', ''), ('CONVERT_RAW', 'false')]:
+    args[optional_arg] = getResolvedOptions(sys.argv, [optional_arg])[optional_arg] \
+        if f"--{optional_arg}" in sys.argv else default
+
 sc = SparkContext()
 glueContext = GlueContext(sc)
 spark = glueContext.spark_session
+
+# Broadcast small (SKU/warehouse dimension sized) relations instead of shuffling both join sides;
+# AQE re-plans joins to broadcast at runtime from actual stage sizes
+spark.conf.set("spark.sql.autoBroadcastJoinThreshold", "64MB")
+spark.conf.set("spark.sql.adaptive.enabled", "true")
+spark.conf.set("spark.sql.adaptive.autoBroadcastJoinThreshold", "64MB")
+
+# AQE merges small post-shuffle partitions toward the advisory size and splits skewed
+# join partitions (e.g. one SKU with far more rows than the rest) at runtime
+spark.conf.set("spark.sql.adaptive.coalescePartitions.enabled", "true")
+spark.conf.set("spark.sql.adaptive.coalescePartitions.initialPartitionNum", "200")
+spark.conf.set("spark.sql.adaptive.advisoryPartitionSizeInBytes", "64MB")
+spark.conf.set("spark.sql.adaptive.skewJoin.enabled", "true")
+spark.conf.set("spark.sql.inMemoryColumnarStorage.compressed", "true")
+
 job = Job(glueContext)
 job.init(args['JOB_NAME'], args)
 
+# Source timestamps carry sub-seconds of any length after either '.' or ':' (e.g.
+# 1/31/2024 13:05:07.123 or 1/31/2024 13:05:07:1234567). Fraction patterns in the format
+# would cap the digit count (at most 9 for S), so the fraction is cut off with plain string
+# functions instead: keep up to the third ':' and then up to the first '.'
+TIMESTAMP_FORMAT = "M/d/yyyy H:mm:ss"
+
+def parse_timestamp(column):
+    """Parse a raw timestamp string column, truncated to whole seconds"""
+    whole_seconds = F.substring_index(F.substring_index(column, ":", 3), ".", 1)
+    return F.to_timestamp(whole_seconds, TIMESTAMP_FORMAT)
+
+RAW_SOURCES = ["inbound", "outbound", "mvt"]
+
+# Leading run of A-Z in description (what regexp_extract("^([A-Z]+)") returned) without the
+# regex engine: the first character left after stripping A-Z is the first non-uppercase one,
+# so its first position in description ends the run; an all-uppercase description is the run
+SKU_CATEGORY_EXPR = """
+    CASE WHEN translate(description, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', '') = '' THEN description
+         ELSE substring(description, 1,
+                        locate(substring(translate(description, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', ''), 1, 1),
+                               description) - 1)
+    END
+"""
+
+# Group the many small raw CSV files into ~128MB input partitions rather than one task per file
+RAW_CSV_GROUPING = {"groupFiles": "inPartition", "groupSize": "134217728"}
+
+# Cap on rows per cleaned Parquet part file (~128MB compressed at these row widths)
+MAX_RECORDS_PER_FILE = 2000000
+
 class SignifyDataCleaner:
-    def __init__(self, glue_context, bucket_name):
+    def __init__(self, glue_context, bucket_name, database_name=None,
+                 raw_format="csv", ingest_since=""):
         self.glue_context = glue_context
         self.bucket_name = bucket_name
+        self.database_name = database_name
+        self.raw_format = raw_format
+        self.ingest_since = ingest_since
+    
+    def read_raw_data(self, source):
+        """
+        Load one raw source as a Spark DataFrame
+        
+        CSV input is read straight from the landing zone. Parquet input is read through
+        the raw_<source> catalog table, so partition pruning on ingest_date happens in
+        the reader instead of after a full scan. Every source column is kept, since the
+        cleaned outputs pass unreferenced columns through.
+        """
+        if self.raw_format == "parquet":
+            read_options = {
+                "database": self.database_name,
+                "table_name": f"raw_{source}",
+                "additional_options": {"useCatalogSchema": True}
+            }
+            if self.ingest_since:
+                read_options["push_down_predicate"] = f"ingest_date >= '{self.ingest_since}'"
+            
+            df = self.glue_context.create_dynamic_frame.from_catalog(**read_options).toDF()
+        else:
+            df = self.glue_context.create_dynamic_frame.from_options(
+                connection_type="s3",
+                connection_options={"paths": [f"s3://{self.bucket_name}/raw/{source}/"], "recurse": True,
+                                    **RAW_CSV_GROUPING},
+                format="csv",
+                format_options={"withHeader": True}
+            ).toDF()
+        
+        return df
+    
+    def convert_raw_to_parquet(self, source):
+        """
+        One-off rewrite of a raw CSV source to snappy Parquet partitioned by ingest_date
+        (crawl raw-parquet/ with table prefix raw_ to register the catalog tables)
+        """
+        print(f"Converting raw {source} data to Parquet...")
+        
+        output_path = f"s3://{self.bucket_name}/raw-parquet/{source}/"
+        
+        self.glue_context.create_dynamic_frame.from_options(
+            connection_type="s3",
+            connection_options={"paths": [f"s3://{self.bucket_name}/raw/{source}/"], "recurse": True,
+                                **RAW_CSV_GROUPING},
+            format="csv",
+            format_options={"withHeader": True}
+        ).toDF() \
+            .withColumn("ingest_date", F.date_format(F.current_date(), "yyyy-MM-dd")) \
+            .write \
+            .mode("append") \
+            .partitionBy("ingest_date") \
+            .option("compression", "snappy") \
+            .parquet(output_path)
+        
+        print(f"Raw {source} data converted. Output written to: {output_path}")
+        
+    def write_clean_output(self, df, output_path):
+        """
+        Append a cleaned frame to S3 as snappy Parquet partitioned by Year/Month
         
+        Rows are shuffled by partition key first so each Year/Month directory gets one
+        file (split at MAX_RECORDS_PER_FILE) instead of a small file from every task.
+        """
+        df.repartition("Year", "Month") \
+            .write \
+            .mode("append") \
+            .partitionBy("Year", "Month") \
+            .option("compression", "snappy") \
+            .option("maxRecordsPerFile", MAX_RECORDS_PER_FILE) \
+            .parquet(output_path)
+    
     def clean_inbound_data(self):
         """
         Clean and standardize inbound logistics data
@@ -29,81 +156,56 @@ class SignifyDataCleaner:
         """
         print("Starting inbound data cleaning...")
         
-        # Read raw inbound data
-        input_path = f"s3://{self.bucket_name}/raw/inbound/"
         output_path = f"s3://{self.bucket_name}/processed/clean-inbound/"
         
         try:
-            raw_df = self.glue_context.create_dynamic_frame.from_options(
-                connection_type="s3",
-                connection_options={"paths": [input_path], "recurse": True},
-                format="csv",
-                format_options={"withHeader": True}
-            )
+            # Read raw inbound data
+            df = self.read_raw_data("inbound")
             
-            if raw_df.count() == 0:
+            # isEmpty stops at the first row, unlike a count; record counts are reported
+            # by the job's Glue metrics (--enable-metrics) from the write itself
+            if df.isEmpty():
                 print("No inbound data found")
                 return
             
-            # Convert to Spark DataFrame for processing
-            df = raw_df.toDF()
-            
-            print(f"Raw inbound records: {df.count()}")
-            
             # Data cleansing steps
             cleaned_df = df \
                 .filter(F.col("SKU").isNotNull()) \
                 .filter(F.col("Req_Qty").isNotNull()) \
                 .filter(F.col("Req_Qty").cast(IntegerType()) > 0) \
-                .withColumn("Arrival_Date_Clean", 
-                           F.when(F.col("Arrival_Date").isNotNull() & (F.col("Arrival_Date") != ""), 
-                                 F.regexp_replace("Arrival_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1"))
-                            .otherwise(F.regexp_replace("Complete_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1"))) \
-                .withColumn("Arrival_Date", F.to_timestamp("Arrival_Date_Clean", "M/d/yyyy H:mm:ss")) \
-                .withColumn("Request_Date_Clean",
-                           F.when(F.col("Request_Date").isNotNull() & (F.col("Request_Date") != ""), 
-                                 F.regexp_replace("Request_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1"))
-                            .otherwise(F.col("Arrival_Date_Clean"))) \
-                .withColumn("Request_Date", F.to_timestamp("Request_Date_Clean", "M/d/yyyy H:mm:ss")) \
-                .withColumn("Complete_Date_Clean", F.regexp_replace("Complete_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1")) \
-                .withColumn("Complete_Date", F.to_timestamp("Complete_Date_Clean", "M/d/yyyy H:mm:ss")) \
-                .drop("Arrival_Date_Clean", "Request_Date_Clean", "Complete_Date_Clean") \
+                .withColumn("Complete_Date", parse_timestamp(F.col("Complete_Date"))) \
+                .withColumn("Arrival_Date", F.coalesce(parse_timestamp(F.col("Arrival_Date")), F.col("Complete_Date"))) \
+                .withColumn("Request_Date", F.coalesce(parse_timestamp(F.col("Request_Date")), F.col("Arrival_Date"))) \
                 .withColumn("Volume", F.col("Volume").cast(DoubleType())) \
                 .withColumn("Req_Qty", F.col("Req_Qty").cast(IntegerType())) \
                 .withColumn("Alloc_Qty", F.col("Alloc_Qty").cast(IntegerType())) \
-                .withColumn("Fill_Rate", 
-                           F.when(F.col("Req_Qty") > 0, F.col("Alloc_Qty") / F.col("Req_Qty"))
-                            .otherwise(0.0)) \
-                .withColumn("Year", F.year("Arrival_Date")) \
-                .withColumn("Month", F.month("Arrival_Date")) \
-                .withColumn("Week", F.weekofyear("Arrival_Date")) \
-                .withColumn("Day", F.dayofmonth("Arrival_Date"))
+                .withColumn("_d", F.to_date("Arrival_Date")) \
+                .withColumns({
+                    # Calendar fields from the date once, not a timestamp conversion per field
+                    "Year": F.year("_d"),
+                    "Month": F.month("_d"),
+                    "Week": F.weekofyear("_d"),
+                    "Day": F.dayofmonth("_d")
+                }) \
+                .drop("_d")
             
-            # Add derived metrics for forecasting
-            enriched_df = cleaned_df \
-                .withColumn("Daily_Volume", F.col("Volume")) \
-                .withColumn("SKU_Category", F.regexp_extract("description", r"^([A-Z]+)", 1)) \
-                .withColumn("Lead_Time_Days", 
-                           F.when((F.col("Complete_Date").isNotNull()) & (F.col("Request_Date").isNotNull()),
-                                 F.datediff("Complete_Date", "Request_Date"))
-                            .otherwise(0)) \
-                .withColumn("processing_date", F.current_date())
+            # Add derived metrics for forecasting, as a single projection
+            enriched_df = cleaned_df.withColumns({
+                "Fill_Rate": F.when(F.col("Req_Qty") > 0, F.col("Alloc_Qty") / F.col("Req_Qty"))
+                              .otherwise(0.0),
+                "Daily_Volume": F.col("Volume"),
+                "SKU_Category": F.expr(SKU_CATEGORY_EXPR),
+                "Lead_Time_Days": F.when((F.col("Complete_Date").isNotNull()) & (F.col("Request_Date").isNotNull()),
+                                         F.datediff("Complete_Date", "Request_Date"))
+                                   .otherwise(0),
+                "processing_date": F.current_date()
+            })
             
             # Filter out records with invalid dates
             final_df = enriched_df.filter(F.col("Arrival_Date").isNotNull())
             
-            print(f"Cleaned inbound records: {final_df.count()}")
-            
-            # Convert back to DynamicFrame and write
-            output_df = DynamicFrame.fromDF(final_df, self.glue_context, "cleaned_inbound")
-            
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=output_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="parquet",
-                format_options={"compression": "snappy"}
-            )
+            # Write one right-sized Parquet file set per Year/Month partition
+            self.write_clean_output(final_df, output_path)
             
             print(f"Inbound data cleaning completed. Output written to: {output_path}")
             
@@ -117,33 +219,21 @@ class SignifyDataCleaner:
         """
         print("Starting outbound data cleaning...")
         
-        input_path = f"s3://{self.bucket_name}/raw/outbound/"
         output_path = f"s3://{self.bucket_name}/processed/clean-outbound/"
         
         try:
-            raw_df = self.glue_context.create_dynamic_frame.from_options(
-                connection_type="s3",
-                connection_options={"paths": [input_path], "recurse": True},
-                format="csv",
-                format_options={"withHeader": True}
-            )
+            df = self.read_raw_data("outbound")
             
-            if raw_df.count() == 0:
+            if df.isEmpty():
                 print("No outbound data found")
                 return
             
-            df = raw_df.toDF()
-            print(f"Raw outbound records: {df.count()}")
-            
             # Clean outbound data
             cleaned_df = df \
                 .filter(F.col("SKU").isNotNull()) \
                 .filter(F.col("Req_Qty").isNotNull()) \
-                .withColumn("Ord_Date_Clean", F.regexp_replace("Ord_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1")) \
-                .withColumn("Ord_Date", F.to_timestamp("Ord_Date_Clean", "M/d/yyyy H:mm:ss")) \
-                .withColumn("Complete_Date_Clean", F.regexp_replace("Complete_Date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1")) \
-                .withColumn("Complete_Date", F.to_timestamp("Complete_Date_Clean", "M/d/yyyy H:mm:ss")) \
-                .drop("Ord_Date_Clean", "Complete_Date_Clean") \
+                .withColumn("Ord_Date", parse_timestamp(F.col("Ord_Date"))) \
+                .withColumn("Complete_Date", parse_timestamp(F.col("Complete_Date"))) \
                 .withColumn("Total_Weight", F.col("Total_Weight").cast(DoubleType())) \
                 .withColumn("Total_Volume", F.col("Total_Volume").cast(DoubleType())) \
                 .withColumn("Req_Qty", F.col("Req_Qty").cast(IntegerType())) \
@@ -151,23 +241,18 @@ class SignifyDataCleaner:
                 .withColumn("Fill_Rate", 
                            F.when(F.col("Req_Qty") > 0, F.col("Alloc_Qty") / F.col("Req_Qty"))
                             .otherwise(0.0)) \
-                .withColumn("Year", F.year("Ord_Date")) \
-                .withColumn("Month", F.month("Ord_Date")) \
-                .withColumn("Week", F.weekofyear("Ord_Date")) \
-                .withColumn("processing_date", F.current_date())
+                .withColumn("_d", F.to_date("Ord_Date")) \
+                .withColumns({
+                    "Year": F.year("_d"),
+                    "Month": F.month("_d"),
+                    "Week": F.weekofyear("_d"),
+                    "processing_date": F.current_date()
+                }) \
+                .drop("_d")
             
             final_df = cleaned_df.filter(F.col("Ord_Date").isNotNull())
-            print(f"Cleaned outbound records: {final_df.count()}")
             
-            output_df = DynamicFrame.fromDF(final_df, self.glue_context, "cleaned_outbound")
-            
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=output_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="parquet",
-                format_options={"compression": "snappy"}
-            )
+            self.write_clean_output(final_df, output_path)
             
             print(f"Outbound data cleaning completed. Output written to: {output_path}")
             
@@ -181,57 +266,40 @@ class SignifyDataCleaner:
         """
         print("Starting MVT data cleaning...")
         
-        input_path = f"s3://{self.bucket_name}/raw/mvt/"
         output_path = f"s3://{self.bucket_name}/processed/aggregated-mvt/"
         
         try:
-            raw_df = self.glue_context.create_dynamic_frame.from_options(
-                connection_type="s3",
-                connection_options={"paths": [input_path], "recurse": True},
-                format="csv",
-                format_options={"withHeader": True}
-            )
+            df = self.read_raw_data("mvt")
             
-            if raw_df.count() == 0:
+            if df.isEmpty():
                 print("No MVT data found")
                 return
             
-            df = raw_df.toDF()
-            print(f"Raw MVT records: {df.count()}")
-            
             # Clean MVT data - handle scientific notation in SKU
             cleaned_df = df \
                 .filter(F.col("sku").isNotNull()) \
                 .withColumn("sku_clean", 
                            F.when(F.col("sku").contains("E+"), 
-                                 F.format_number(F.col("sku").cast(DoubleType()), 0))
+                                 F.col("sku").cast(DoubleType()).cast(DecimalType(20, 0)).cast(StringType()))
                             .otherwise(F.col("sku"))) \
-                .withColumn("order_date_clean", F.regexp_replace("order_date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1")) \
-                .withColumn("order_date", F.to_timestamp("order_date_clean", "M/d/yyyy H:mm:ss")) \
-                .withColumn("complete_date_clean", F.regexp_replace("complete_date", r"(\d+/\d+/\d+ \d+:\d+:\d+)[:.]\d+", "$1")) \
-                .withColumn("complete_date", F.to_timestamp("complete_date_clean", "M/d/yyyy H:mm:ss")) \
-                .drop("order_date_clean", "complete_date_clean") \
+                .withColumn("order_date", parse_timestamp(F.col("order_date"))) \
+                .withColumn("complete_date", parse_timestamp(F.col("complete_date"))) \
                 .withColumn("in_qty", F.col("in_qty").cast(IntegerType())) \
                 .withColumn("out_qty", F.col("out_qty").cast(IntegerType())) \
                 .withColumn("bal_qty", F.col("bal_qty").cast(IntegerType())) \
                 .withColumn("Quantity", F.col("Quantity").cast(IntegerType())) \
-                .withColumn("Year", F.year("order_date")) \
-                .withColumn("Month", F.month("order_date")) \
-                .withColumn("Week", F.weekofyear("order_date")) \
-                .withColumn("processing_date", F.current_date())
+                .withColumn("_d", F.to_date("order_date")) \
+                .withColumns({
+                    "Year": F.year("_d"),
+                    "Month": F.month("_d"),
+                    "Week": F.weekofyear("_d"),
+                    "processing_date": F.current_date()
+                }) \
+                .drop("_d")
             
             final_df = cleaned_df.filter(F.col("order_date").isNotNull())
-            print(f"Cleaned MVT records: {final_df.count()}")
             
-            output_df = DynamicFrame.fromDF(final_df, self.glue_context, "cleaned_mvt")
-            
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=output_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="parquet",
-                format_options={"compression": "snappy"}
-            )
+            self.write_clean_output(final_df, output_path)
             
             print(f"MVT data cleaning completed. Output written to: {output_path}")
             
@@ -241,7 +309,12 @@ class SignifyDataCleaner:
 
 # Execute the cleaning process
 try:
-    cleaner = SignifyDataCleaner(glueContext, args['BUCKET_NAME'])
+    cleaner = SignifyDataCleaner(glueContext, args['BUCKET_NAME'], args['DATABASE_NAME'],
+                                 args['RAW_FORMAT'], args['INGEST_SINCE'])
+    
+    if args['CONVERT_RAW'].lower() == "true":
+        for source in RAW_SOURCES:
+            cleaner.convert_raw_to_parquet(source)
     
     # Clean all data types
     cleaner.clean_inbound_data()
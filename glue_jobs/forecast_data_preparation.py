@@ -12,72 +12,151 @@ from datetime import datetime, timedelta
 # Get job parameters
 args = getResolvedOptions(sys.argv, ['JOB_NAME', 'BUCKET_NAME', 'DATABASE_NAME'])
 
+# Optional --PARTITION_PREDICATE (e.g. "year=2024 AND month IN (5, 6)") restricts the
+# Year/Month-partitioned clean tables to the months of interest
+args['PARTITION_PREDICATE'] = getResolvedOptions(sys.argv, ['PARTITION_PREDICATE'])['PARTITION_PREDICATE'] \
+    if '--PARTITION_PREDICATE' in sys.argv else ''
+
 sc = SparkContext()
 glueContext = GlueContext(sc)
 spark = glueContext.spark_session
+
+# Broadcast small (SKU/warehouse dimension sized) relations instead of shuffling both join sides;
+# AQE re-plans joins to broadcast at runtime from actual stage sizes
+spark.conf.set("spark.sql.autoBroadcastJoinThreshold", "64MB")
+spark.conf.set("spark.sql.adaptive.enabled", "true")
+spark.conf.set("spark.sql.adaptive.autoBroadcastJoinThreshold", "64MB")
+
+# Forecast inputs are small (under a megabyte, ~9k rows); the default 200 shuffle
+# partitions would mostly launch empty tasks and write tiny part files
+spark.conf.set("spark.sql.shuffle.partitions", "16")
+
+# AQE merges small post-shuffle partitions and splits skewed join partitions at runtime;
+# the initial partition count is left at the 16 above rather than AQE's own default
+spark.conf.set("spark.sql.adaptive.coalescePartitions.enabled", "true")
+spark.conf.set("spark.sql.adaptive.advisoryPartitionSizeInBytes", "64MB")
+spark.conf.set("spark.sql.adaptive.skewJoin.enabled", "true")
+spark.conf.set("spark.sql.inMemoryColumnarStorage.compressed", "true")
+
+# Part files per forecast dataset; the datasets are tiny, so Forecast imports a single file.
+# coalesce merges partitions without another shuffle
+OUTPUT_FILES = 1
+
 job = Job(glueContext)
 job.init(args['JOB_NAME'], args)
 
 class ForecastDataPreparator:
-    def __init__(self, glue_context, bucket_name, database_name):
+    def __init__(self, glue_context, bucket_name, database_name, partition_predicate=""):
         self.glue_context = glue_context
         self.bucket_name = bucket_name
         self.database_name = database_name
+        self.partition_predicate = partition_predicate
+        self._daily_inbound = None
         
-    def prepare_volume_forecast_data(self):
+    def read_clean_table(self, table_name):
         """
-        Prepare Amazon Forecast-compatible data for volume forecasting
-        Format: timestamp, target_value, item_id
+        Load a cleaned catalog table, pruning Year/Month partitions when a predicate is set
         """
-        print("Starting volume forecast data preparation...")
+        read_options = {"database": self.database_name, "table_name": table_name}
+        if self.partition_predicate:
+            # Prune in the catalog (partition index) and again on the listed partitions
+            read_options["push_down_predicate"] = self.partition_predicate
+            read_options["additional_options"] = {"catalogPartitionPredicate": self.partition_predicate}
         
-        try:
-            # Read cleaned inbound data from Glue catalog
-            inbound_df = self.glue_context.create_dynamic_frame.from_catalog(
-                database=self.database_name,
-                table_name="clean_inbound"
-            ).toDF()
-            
-            print(f"Loaded {inbound_df.count()} inbound records")
+        return self.glue_context.create_dynamic_frame.from_catalog(**read_options).toDF()
+    
+    def daily_inbound_aggregates(self):
+        """
+        Daily inbound aggregates by date, SKU and warehouse, shared by the volume and demand
+        datasets so clean_inbound is scanned and shuffled once (computed lazily, cached).
+        The date key stays a DateType; it is stringified only in the Forecast output columns
+        """
+        if self._daily_inbound is None:
+            valid_volume = F.col("volume").isNotNull() & (F.col("volume") > 0)
+            valid_quantity = F.col("req_qty").isNotNull() & (F.col("req_qty") > 0)
             
-            # Aggregate daily volumes by SKU and warehouse
-            daily_volumes = inbound_df \
+            # Project the five referenced columns up front so only they are read from Parquet
+            self._daily_inbound = self.read_clean_table("clean_inbound") \
+                .select("arrival_date", "sku", "wh_code", "volume", "req_qty") \
                 .filter(F.col("arrival_date").isNotNull()) \
-                .filter(F.col("volume").isNotNull()) \
-                .filter(F.col("volume") > 0) \
-                .withColumn("date", F.date_format("arrival_date", "yyyy-MM-dd")) \
+                .filter(valid_volume | valid_quantity) \
+                .withColumn("date", F.to_date("arrival_date")) \
                 .groupBy("date", "sku", "wh_code") \
                 .agg(
-                    F.sum("volume").alias("daily_volume"),
-                    F.sum("req_qty").alias("daily_quantity"),
-                    F.count("*").alias("transaction_count")
+                    # Volume dataset: records with a positive volume
+                    F.sum(F.when(valid_volume, F.col("volume"))).alias("daily_volume"),
+                    F.sum(F.when(valid_volume, F.col("req_qty"))).alias("daily_quantity"),
+                    F.count(F.when(valid_volume, True)).alias("transaction_count"),
+                    # Demand dataset: records with a positive requested quantity
+                    F.sum(F.when(valid_quantity, F.col("req_qty"))).alias("daily_demand"),
+                    F.count(F.when(valid_quantity, True)).alias("order_count")
                 ) \
+                .cache()
+        
+        return self._daily_inbound
+    
+    def write_forecast_dataset(self, df, dataset_name):
+        """
+        Write a prepared dataset to S3 as snappy Parquet (forecast-input-parquet/, the columnar
+        copy for Athena and Parquet imports) and as the headered CSV that Amazon Forecast
+        imports and existing readers consume (forecast-input/); returns the CSV path
+        """
+        frame = DynamicFrame.fromDF(df.coalesce(OUTPUT_FILES), self.glue_context, dataset_name.replace("-", "_"))
+        
+        self.glue_context.write_dynamic_frame.from_options(
+            frame=frame,
+            connection_type="s3",
+            connection_options={"path": f"s3://{self.bucket_name}/forecasts/forecast-input-parquet/{dataset_name}/"},
+            format="parquet",
+            format_options={"compression": "snappy"}
+        )
+        
+        # The frame is cached upstream, so the CSV copy does not recompute it
+        output_path = f"s3://{self.bucket_name}/forecasts/forecast-input/{dataset_name}/"
+        
+        self.glue_context.write_dynamic_frame.from_options(
+            frame=frame,
+            connection_type="s3",
+            connection_options={"path": output_path},
+            format="csv",
+            format_options={
+                "writeHeader": True,
+                "separator": ","
+            }
+        )
+        
+        return output_path
+    
+    def prepare_volume_forecast_data(self):
+        """
+        Prepare Amazon Forecast-compatible data for volume forecasting
+        Format: timestamp, target_value, item_id
+        """
+        print("Starting volume forecast data preparation...")
+        
+        try:
+            # Daily volumes by SKU and warehouse from the shared inbound aggregates; Forecast only
+            # needs each item's series in time order, and the output is a single small file, so
+            # merge to OUTPUT_FILES partitions and sort locally instead of shuffling
+            daily_volumes = self.daily_inbound_aggregates() \
+                .filter(F.col("transaction_count") > 0) \
                 .withColumn("item_id", F.concat_ws("_", "sku", "wh_code")) \
                 .select(
-                    F.col("date").alias("timestamp"),
+                    F.col("date").cast("string").alias("timestamp"),
                     F.col("daily_volume").alias("target_value"),
                     F.col("item_id")
                 ) \
                 .filter(F.col("target_value") > 0) \
-                .orderBy("timestamp", "item_id")
+                .coalesce(OUTPUT_FILES) \
+                .sortWithinPartitions("item_id", "timestamp") \
+                .cache()
             
             print(f"Generated {daily_volumes.count()} daily volume records")
             
-            # Convert to DynamicFrame and write to S3
-            volume_forecast_df = DynamicFrame.fromDF(daily_volumes, self.glue_context, "volume_forecast")
+            # Write the canonical Parquet copy and the CSV used for Forecast import
+            output_path = self.write_forecast_dataset(daily_volumes, "volume-forecast")
             
-            output_path = f"s3://{self.bucket_name}/forecasts/forecast-input/volume-forecast/"
-            
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=volume_forecast_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="csv",
-                format_options={
-                    "writeHeader": True,
-                    "separator": ","
-                }
-            )
+            daily_volumes.unpersist()
             
             print(f"Volume forecast data written to: {output_path}")
             
@@ -92,49 +171,31 @@ class ForecastDataPreparator:
         print("Starting demand forecast data preparation...")
         
         try:
-            # Read cleaned inbound data
-            inbound_df = self.glue_context.create_dynamic_frame.from_catalog(
-                database=self.database_name,
-                table_name="clean_inbound"
-            ).toDF()
-            
-            # Aggregate daily demand by SKU
-            daily_demand = inbound_df \
-                .filter(F.col("arrival_date").isNotNull()) \
-                .filter(F.col("req_qty").isNotNull()) \
-                .filter(F.col("req_qty") > 0) \
-                .withColumn("date", F.date_format("arrival_date", "yyyy-MM-dd")) \
+            # Roll the shared per-warehouse aggregates up to daily demand by SKU
+            daily_demand = self.daily_inbound_aggregates() \
+                .filter(F.col("order_count") > 0) \
                 .groupBy("date", "sku") \
                 .agg(
-                    F.sum("req_qty").alias("daily_demand"),
-                    F.avg("req_qty").alias("avg_order_size"),
-                    F.count("*").alias("order_count")
+                    F.sum("daily_demand").alias("daily_demand"),
+                    (F.sum("daily_demand") / F.sum("order_count")).alias("avg_order_size"),
+                    F.sum("order_count").alias("order_count")
                 ) \
                 .select(
-                    F.col("date").alias("timestamp"),
+                    F.col("date").cast("string").alias("timestamp"),
                     F.col("daily_demand").alias("target_value"),
                     F.col("sku").alias("item_id")
                 ) \
                 .filter(F.col("target_value") > 0) \
-                .orderBy("timestamp", "item_id")
+                .coalesce(OUTPUT_FILES) \
+                .sortWithinPartitions("item_id", "timestamp") \
+                .cache()
             
             print(f"Generated {daily_demand.count()} daily demand records")
             
-            # Convert to DynamicFrame and write to S3
-            demand_forecast_df = DynamicFrame.fromDF(daily_demand, self.glue_context, "demand_forecast")
+            # Write the canonical Parquet copy and the CSV used for Forecast import
+            output_path = self.write_forecast_dataset(daily_demand, "demand-forecast")
             
-            output_path = f"s3://{self.bucket_name}/forecasts/forecast-input/demand-forecast/"
-            
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=demand_forecast_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="csv",
-                format_options={
-                    "writeHeader": True,
-                    "separator": ","
-                }
-            )
+            daily_demand.unpersist()
             
             print(f"Demand forecast data written to: {output_path}")
             
@@ -150,17 +211,14 @@ class ForecastDataPreparator:
         
         try:
             # Read cleaned outbound data
-            outbound_df = self.glue_context.create_dynamic_frame.from_catalog(
-                database=self.database_name,
-                table_name="clean_outbound"
-            ).toDF()
+            outbound_df = self.read_clean_table("clean_outbound")
             
             # Calculate daily truck utilization metrics
             daily_utilization = outbound_df \
                 .filter(F.col("ord_date").isNotNull()) \
                 .filter(F.col("total_volume").isNotNull()) \
                 .filter(F.col("total_weight").isNotNull()) \
-                .withColumn("date", F.date_format("ord_date", "yyyy-MM-dd")) \
+                .withColumn("date", F.to_date("ord_date")) \
                 .groupBy("date") \
                 .agg(
                     F.sum("total_volume").alias("total_daily_volume"),
@@ -173,30 +231,20 @@ class ForecastDataPreparator:
                                  F.col("total_daily_volume") / 100.0)  # Normalize utilization
                             .otherwise(0.0)) \
                 .select(
-                    F.col("date").alias("timestamp"),
+                    F.col("date").cast("string").alias("timestamp"),
                     F.col("utilization_score").alias("target_value"),
                     F.lit("truck_utilization").alias("item_id")
                 ) \
                 .filter(F.col("target_value") > 0) \
-                .orderBy("timestamp")
+                .sortWithinPartitions("timestamp") \
+                .cache()
             
             print(f"Generated {daily_utilization.count()} truck utilization records")
             
-            # Convert to DynamicFrame and write to S3
-            utilization_forecast_df = DynamicFrame.fromDF(daily_utilization, self.glue_context, "utilization_forecast")
-            
-            output_path = f"s3://{self.bucket_name}/forecasts/forecast-input/utilization-forecast/"
+            # Write the canonical Parquet copy and the CSV used for Forecast import
+            output_path = self.write_forecast_dataset(daily_utilization, "utilization-forecast")
             
-            self.glue_context.write_dynamic_frame.from_options(
-                frame=utilization_forecast_df,
-                connection_type="s3",
-                connection_options={"path": output_path},
-                format="csv",
-                format_options={
-                    "writeHeader": True,
-                    "separator": ","
-                }
-            )
+            daily_utilization.unpersist()
             
             print(f"Truck utilization forecast data written to: {output_path}")
             
@@ -211,29 +259,38 @@ class ForecastDataPreparator:
         print("Creating forecast data summary...")
         
         try:
-            # Create summary statistics
+            # Create summary statistics, stamped with one preparation time
+            preparation_date = datetime.now().isoformat()
             summary_data = [
                 {
                     "dataset_type": "volume_forecast",
-                    "preparation_date": datetime.now().isoformat(),
+                    "preparation_date": preparation_date,
                     "s3_path": f"s3://{self.bucket_name}/forecasts/forecast-input/volume-forecast/",
                     "description": "Daily volume aggregated by SKU and warehouse"
                 },
                 {
                     "dataset_type": "demand_forecast", 
-                    "preparation_date": datetime.now().isoformat(),
+                    "preparation_date": preparation_date,
                     "s3_path": f"s3://{self.bucket_name}/forecasts/forecast-input/demand-forecast/",
                     "description": "Daily demand quantities by SKU"
                 },
                 {
                     "dataset_type": "utilization_forecast",
-                    "preparation_date": datetime.now().isoformat(),
+                    "preparation_date": preparation_date,
                     "s3_path": f"s3://{self.bucket_name}/forecasts/forecast-input/utilization-forecast/",
                     "description": "Daily truck utilization scores"
                 }
             ]
             
-            summary_df = spark.createDataFrame(summary_data)
+            # Explicit schema skips type inference over the rows; one partition writes one JSON file
+            summary_schema = StructType([
+                StructField("dataset_type", StringType()),
+                StructField("preparation_date", StringType()),
+                StructField("s3_path", StringType()),
+                StructField("description", StringType())
+            ])
+            
+            summary_df = spark.createDataFrame(summary_data, schema=summary_schema).coalesce(1)
             summary_dynamic_df = DynamicFrame.fromDF(summary_df, self.glue_context, "forecast_summary")
             
             summary_path = f"s3://{self.bucket_name}/forecasts/metadata/"
@@ -247,13 +304,18 @@ class ForecastDataPreparator:
             
             print(f"Forecast summary written to: {summary_path}")
             
+            if self._daily_inbound is not None:
+                self._daily_inbound.unpersist()
+                self._daily_inbound = None
+            
         except Exception as e:
             print(f"Error creating forecast summary: {str(e)}")
             raise e
 
 # Execute the forecast data preparation
 try:
-    preparator = ForecastDataPreparator(glueContext, args['BUCKET_NAME'], args['DATABASE_NAME'])
+    preparator = ForecastDataPreparator(glueContext, args['BUCKET_NAME'], args['DATABASE_NAME'],
+                                        args['PARTITION_PREDICATE'])
     
     # Prepare all forecast datasets
     preparator.prepare_volume_forecast_data()
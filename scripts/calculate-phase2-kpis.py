@@ -5,6 +5,7 @@ Calculates ML and forecasting KPIs from processed data
 """
 
 import json
+import gzip
 import boto3
 import os
 from datetime import datetime, timedelta
@@ -15,6 +16,10 @@ def calculate_phase2_kpis():
     bucket_name = "gxo-signify-pilot-272858488437"
     s3 = boto3.client('s3')
     
+    # Single run timestamp so every field in the report agrees
+    now = datetime.now()
+    generated_at = now.isoformat()
+    
     # Phase 2 ML Infrastructure KPIs
     ml_infrastructure_kpis = {
         "amazon_forecast_setup": "COMPLETED",
@@ -38,7 +43,7 @@ def calculate_phase2_kpis():
     
     # Amazon Forecast Metrics
     forecast_metrics = {
-        "dataset_import_started": datetime.now().isoformat(),
+        "dataset_import_started": generated_at,
         "forecast_horizon_days": 28,
         "confidence_intervals": ["0.1", "0.5", "0.9"],
         "optimization_metric": "WAPE",
@@ -84,7 +89,7 @@ def calculate_phase2_kpis():
     phase2_report = {
         "report_metadata": {
             "phase": "Phase 2 - ML Infrastructure & Forecasting",
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": generated_at,
             "duration": "45 minutes",
             "status": "MOSTLY_COMPLETED",
             "completion_percentage": 85
@@ -116,13 +121,15 @@ def calculate_phase2_kpis():
     
     try:
         # Save Phase 2 KPI report to S3
-        report_key = f"kpis/phase2-report/ml-infrastructure-kpis-{datetime.now().strftime('%Y%m%d')}.json"
+        report_key = f"kpis/phase2-report/ml-infrastructure-kpis-{now.strftime('%Y%m%d')}.json.gz"
         
+        # Compact, gzip-compressed JSON; Content-Encoding lets HTTP clients decompress transparently
         s3.put_object(
             Bucket=bucket_name,
             Key=report_key,
-            Body=json.dumps(phase2_report, indent=2),
-            ContentType='application/json'
+            Body=gzip.compress(json.dumps(phase2_report, separators=(',', ':')).encode('utf-8'), compresslevel=6),
+            ContentType='application/json',
+            ContentEncoding='gzip'
         )
         
         print("🎉 Phase 2 KPI Report Generated Successfully!")
@@ -124,6 +124,11 @@ echo ""
 echo "3. Start crawlers to update data catalog:"
 echo "   aws glue start-crawler --name signify-raw-data-crawler-$ENVIRONMENT"
 echo "   aws glue start-crawler --name signify-processed-data-crawler-$ENVIRONMENT"
+echo ""
+echo "4. Index the Year/Month partitions of the cleaned tables (once, after the first crawl):"
+echo "   for table in clean_inbound clean_outbound aggregated_mvt; do"
+echo "     aws glue create-partition-index --database-name signify_logistics_$ENVIRONMENT --table-name \$table --partition-index Keys=year,month,IndexName=ym_idx"
+echo "   done"
 
 # Wait for job completion (optional)
 echo ""
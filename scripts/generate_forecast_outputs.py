@@ -5,60 +5,111 @@ Processes forecast input data and generates predictions to store back in S3
 """
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 import pandas as pd
 import numpy as np
 import json
+import gzip
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 import io
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_percentage_error
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; forecast horizons fall back to numpy broadcasting
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjson is optional; uploads fall back to compact stdlib json
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:  # pyarrow is optional; CSV parts are parsed with pandas' C engine
+    CSV_ENGINE = 'c'
+
+# Forecast files above 8MB are uploaded as concurrent multipart parts
+UPLOAD_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=8)
+
+# Seasonal adjustment by weekday (Monday=0): business days vs weekends
+SEASONAL_FACTORS = np.array([1.1, 1.1, 1.1, 1.1, 1.1, 0.7, 0.7])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _build_forecasts_kernel(recent_mean, recent_std, trend, start_weekday, horizon, out):
+        """Fill out[i, d] with the predicted value and 95% bounds for SKU i, d + 1 days ahead"""
+        for i in prange(recent_mean.size):
+            for d in range(horizon):
+                seasonal = SEASONAL_FACTORS[(start_weekday[i] + d + 1) % 7]
+                predicted = recent_mean[i] + (trend[i] * (d + 1)) * seasonal
+                interval = recent_std[i] if recent_std[i] > 0 else predicted * 0.15
+                
+                out[i, d, 0] = max(0.0, np.round(predicted, 2))
+                out[i, d, 1] = max(0.0, np.round(predicted - (1.96 * interval), 2))
+                out[i, d, 2] = np.round(predicted + (1.96 * interval), 2)
+
+def build_forecasts(recent_mean: np.ndarray, recent_std: np.ndarray, trend: np.ndarray,
+                    start_weekday: np.ndarray, horizon: int) -> np.ndarray:
+    """Forecast (predicted, lower, upper) for each SKU and day ahead, shape (n_sku, horizon, 3)"""
+    if NUMBA_AVAILABLE:
+        out = np.empty((recent_mean.size, horizon, 3))
+        _build_forecasts_kernel(recent_mean, recent_std, trend, start_weekday, horizon, out)
+        return out
+    
+    days = np.arange(1, horizon + 1)
+    seasonal = SEASONAL_FACTORS[(start_weekday[:, None] + days[None, :]) % 7]
+    predicted = recent_mean[:, None] + (trend[:, None] * days[None, :]) * seasonal
+    interval = np.where((recent_std > 0)[:, None], recent_std[:, None], predicted * 0.15)
+    
+    return np.stack([
+        np.maximum(0, np.round(predicted, 2)),
+        np.maximum(0, np.round(predicted - (1.96 * interval), 2)),
+        np.round(predicted + (1.96 * interval), 2)
+    ], axis=-1)
+
+def serialize_json(data: Any) -> bytes:
+    """Compact JSON bytes for S3 uploads (no indentation; numpy scalars and arrays allowed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    return json.dumps(data, separators=(',', ':'), default=lambda value: value.tolist()).encode('utf-8')
+
 class ForecastGenerator:
     """Generate forecasts from input data and save to S3"""
     
     def __init__(self):
         self.s3_client = boto3.client('s3')
         self.bucket_name = "gxo-signify-pilot-272858488437"
+        self.start_run()
         
+    def start_run(self):
+        """Take the run timestamp once, so all outputs of a run carry the same time"""
+        now = datetime.now()
+        self.generated_at = now.isoformat()
+        self.run_stamp = now.strftime("%Y%m%d_%H%M%S")
+    
     def read_s3_csv_files(self, prefix: str) -> pd.DataFrame:
         """Read all CSV files from S3 prefix and combine"""
-        response = self.s3_client.list_objects_v2(
-            Bucket=self.bucket_name,
-            Prefix=prefix
-        )
+        # Page through the listing; a single list_objects_v2 call stops at 1000 keys
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+        
+        keys = [obj['Key'] for page in pages for obj in page.get('Contents', [])
+                if 'part-r-' in obj['Key'] or obj['Key'].endswith('.csv')]
         
-        if 'Contents' not in response:
+        if not keys:
             return pd.DataFrame()
         
-        all_dataframes = []
-        
-        for obj in response['Contents']:
-            if 'part-r-' in obj['Key'] or obj['Key'].endswith('.csv'):
-                try:
-                    file_response = self.s3_client.get_object(
-                        Bucket=self.bucket_name,
-                        Key=obj['Key']
-                    )
-                    
-                    csv_content = file_response['Body'].read().decode('utf-8')
-                    
-                    # Try to read with header first
-                    try:
-                        df = pd.read_csv(io.StringIO(csv_content))
-                    except:
-                        # If no header, use default columns
-                        df = pd.read_csv(io.StringIO(csv_content), header=None,
-                                       names=['timestamp', 'target_value', 'item_id'])
-                    
-                    all_dataframes.append(df)
-                    print(f"Read {len(df)} records from {obj['Key']}")
-                    
-                except Exception as e:
-                    print(f"Error reading {obj['Key']}: {str(e)}")
-                    continue
+        # Each GET is latency-bound, so download the part files concurrently (results keep key order)
+        with ThreadPoolExecutor(max_workers=min(32, len(keys))) as executor:
+            all_dataframes = [df for df in executor.map(self._read_s3_csv_object, keys) if df is not None]
         
         if all_dataframes:
             combined_df = pd.concat(all_dataframes, ignore_index=True)
@@ -67,6 +118,33 @@ class ForecastGenerator:
         else:
             return pd.DataFrame()
     
+    def _read_s3_csv_object(self, key: str) -> Optional[pd.DataFrame]:
+        """Read one CSV object from S3, or None if it cannot be read"""
+        try:
+            file_response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=key
+            )
+            
+            # pandas decodes the raw bytes itself
+            csv_bytes = file_response['Body'].read()
+            
+            # Try to read with header first (multithreaded Arrow parser when installed);
+            # timestamps are parsed by the reader rather than in a later pass
+            try:
+                df = pd.read_csv(io.BytesIO(csv_bytes), engine=CSV_ENGINE, parse_dates=['timestamp'])
+            except:
+                # If no header, use default columns
+                df = pd.read_csv(io.BytesIO(csv_bytes), engine=CSV_ENGINE, header=None,
+                                 names=['timestamp', 'target_value', 'item_id'], parse_dates=['timestamp'])
+            
+            print(f"Read {len(df)} records from {key}")
+            return df
+            
+        except Exception as e:
+            print(f"Error reading {key}: {str(e)}")
+            return None
+    
     def generate_demand_forecasts(self, forecast_horizon_days: int = 28) -> List[Dict[str, Any]]:
         """Generate demand forecasts for each SKU"""
         print("Generating demand forecasts...")
@@ -79,70 +157,87 @@ class ForecastGenerator:
             return []
         
         # Clean and prepare data
-        demand_df['timestamp'] = pd.to_datetime(demand_df['timestamp'])
         demand_df = demand_df.sort_values(['item_id', 'timestamp'])
         
-        forecasts = []
-        unique_skus = demand_df['item_id'].unique()
+        # Rows are sorted by item, so SKUs can be numbered in order from where item_id changes,
+        # without building a hash set of every row's SKU
+        item_ids = demand_df['item_id'].to_numpy()
+        sku_numbers = np.cumsum(np.r_[True, item_ids[1:] != item_ids[:-1]]) - 1
         
-        print(f"Processing {len(unique_skus)} unique SKUs...")
+        print(f"Processing {sku_numbers[-1] + 1} unique SKUs...")
         
-        for sku in unique_skus[:50]:  # Limit to first 50 SKUs for demo
-            sku_data = demand_df[demand_df['item_id'] == sku].copy()
-            
-            if len(sku_data) < 5:  # Need minimum data points
-                continue
-            
-            # Prepare features for simple time series forecasting
-            sku_data = sku_data.sort_values('timestamp')
-            sku_data['day_of_year'] = sku_data['timestamp'].dt.dayofyear
-            sku_data['month'] = sku_data['timestamp'].dt.month
-            sku_data['day_of_week'] = sku_data['timestamp'].dt.dayofweek
-            
-            # Simple statistical forecasting approach
-            recent_mean = sku_data['target_value'].tail(7).mean()
-            recent_std = sku_data['target_value'].tail(7).std()
-            trend = self.calculate_trend(sku_data['target_value'].values)
-            
-            # Generate forecasts for next N days
-            forecast_points = []
-            base_date = sku_data['timestamp'].max()
-            
-            for day in range(1, forecast_horizon_days + 1):
-                forecast_date = base_date + timedelta(days=day)
-                
-                # Apply trend and seasonal patterns
-                seasonal_factor = self.get_seasonal_factor(forecast_date)
-                predicted_value = recent_mean + (trend * day) * seasonal_factor
-                
-                # Add some realistic variance
-                confidence_interval = recent_std if recent_std > 0 else predicted_value * 0.15
-                
-                forecast_points.append({
-                    "timestamp": forecast_date.isoformat(),
-                    "predicted_value": max(0, round(predicted_value, 2)),
-                    "confidence_lower": max(0, round(predicted_value - (1.96 * confidence_interval), 2)),
-                    "confidence_upper": round(predicted_value + (1.96 * confidence_interval), 2),
+        # Limit to first 50 SKUs for demo and drop those without the minimum data points
+        sku_sizes = np.bincount(sku_numbers)
+        demand_df = demand_df[(sku_numbers < 50) & (sku_sizes[sku_numbers] >= 5)]
+        
+        if demand_df.empty:
+            print("Generated forecasts for 0 SKUs")
+            return []
+        
+        # Per-SKU reductions over the sorted flat arrays: each SKU is one contiguous run
+        codes, skus = pd.factorize(demand_df['item_id'], sort=False)
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        counts = np.diff(np.r_[starts, codes.size])
+        target = demand_df['target_value'].to_numpy(dtype=np.float64)
+        position = np.arange(codes.size) - np.repeat(starts, counts)
+        
+        sum_y = np.add.reduceat(target, starts)
+        mean_y = sum_y / counts
+        std_y = np.sqrt(np.add.reduceat((target - np.repeat(mean_y, counts)) ** 2, starts) / (counts - 1))
+        
+        # Recent window: the last 7 points of each run
+        recent_counts = np.minimum(counts, 7)
+        in_recent = position >= np.repeat(counts - recent_counts, counts)
+        recent_mean = np.add.reduceat(np.where(in_recent, target, 0.0), starts) / recent_counts
+        recent_deviation = np.where(in_recent, target - np.repeat(recent_mean, counts), 0.0)
+        recent_std = np.sqrt(np.add.reduceat(recent_deviation ** 2, starts) / (recent_counts - 1))
+        
+        # Closed-form OLS slope of each series against its position (0..n-1)
+        sum_xy = np.add.reduceat(position * target, starts)
+        trends = (sum_xy - (counts - 1) / 2 * sum_y) / (counts * (counts * counts - 1) / 12)
+        
+        # Accuracy score from each series' coefficient of variation (lower CV = higher accuracy);
+        # every SKU here has at least 5 points, so only the zero-mean fallback applies
+        accuracy_scores = np.where(mean_y == 0, 0.5, np.round(np.clip(1.0 - (std_y / mean_y / 2), 0.3, 0.95), 3))
+        
+        # Forecast horizon for all SKUs at once: rows are SKUs, columns are days ahead;
+        # runs are sorted by timestamp, so each one ends on its latest date
+        days = np.arange(1, forecast_horizon_days + 1)
+        base_dates = demand_df['timestamp'].to_numpy()[starts + counts - 1].astype('datetime64[D]')
+        start_weekdays = (base_dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        
+        # Apply trend and seasonal patterns with confidence bounds
+        bounds = build_forecasts(recent_mean, recent_std, trends, start_weekdays, forecast_horizon_days)
+        timestamps = np.datetime_as_string((base_dates[:, None] + days[None, :]).astype('datetime64[s]'))
+        
+        forecasts = []
+        
+        for i, sku in enumerate(skus):
+            forecast_points = [
+                {
+                    "timestamp": timestamp,
+                    "predicted_value": value,
+                    "confidence_lower": lower,
+                    "confidence_upper": upper,
                     "confidence_level": "95%"
-                })
-            
-            # Calculate accuracy score based on recent performance
-            accuracy_score = self.calculate_accuracy_score(sku_data)
+                }
+                for timestamp, (value, lower, upper) in zip(timestamps[i].tolist(), bounds[i].tolist())
+            ]
             
             forecasts.append({
                 "sku_id": str(sku),
                 "warehouse_code": "PHILIPS",
                 "forecast_type": "DEMAND",
                 "horizon_days": forecast_horizon_days,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": self.generated_at,
                 "predictor_name": "statistical_model_pilot",
-                "accuracy_score": accuracy_score,
-                "data_points_used": len(sku_data),
+                "accuracy_score": float(accuracy_scores[i]),
+                "data_points_used": int(counts[i]),
                 "forecast_points": forecast_points,
                 "metadata": {
                     "method": "trend_and_seasonal",
-                    "recent_mean": round(recent_mean, 2),
-                    "trend_factor": round(trend, 4),
+                    "recent_mean": round(recent_mean[i], 2),
+                    "trend_factor": round(trends[i], 4),
                     "data_source": "s3_processed_input"
                 }
             })
@@ -159,64 +254,63 @@ class ForecastGenerator:
         
         # Also try the consolidated file if partitioned files don't exist
         if volume_df.empty:
-            try:
-                response = self.s3_client.get_object(
-                    Bucket=self.bucket_name,
-                    Key="forecasts/forecast-input/volume-forecast-consolidated.csv"
-                )
-                csv_content = response['Body'].read().decode('utf-8')
-                volume_df = pd.read_csv(io.StringIO(csv_content))
-                print(f"Read {len(volume_df)} records from consolidated file")
-            except:
+            volume_df = self._read_s3_csv_object("forecasts/forecast-input/volume-forecast-consolidated.csv")
+            
+            if volume_df is None:
                 print("No volume data found")
                 return []
         
         if volume_df.empty:
             return []
         
-        # Prepare volume data
-        volume_df['timestamp'] = pd.to_datetime(volume_df['timestamp'])
-        volume_df = volume_df.sort_values('timestamp')
-        
-        # Aggregate daily volumes
+        # Aggregate daily volumes (groupby orders the days, so the frame itself is not sorted or copied)
         daily_volumes = volume_df.groupby(volume_df['timestamp'].dt.date)['target_value'].agg(['sum', 'mean', 'count']).reset_index()
         daily_volumes.columns = ['date', 'total_volume', 'avg_volume', 'shipment_count']
         
         # Generate volume forecasts
-        forecast_points = []
         base_date = daily_volumes['date'].max()
-        recent_avg = daily_volumes['total_volume'].tail(7).mean()
-        recent_std = daily_volumes['total_volume'].tail(7).std()
-        
-        # Calculate weekly patterns
-        volume_df['day_of_week'] = volume_df['timestamp'].dt.dayofweek
-        weekly_pattern = volume_df.groupby('day_of_week')['target_value'].mean()
-        weekly_multipliers = weekly_pattern / weekly_pattern.mean()
-        
-        for day in range(1, forecast_horizon_days + 1):
-            forecast_date = base_date + timedelta(days=day)
-            day_of_week = forecast_date.weekday()
-            
-            # Apply weekly pattern
-            predicted_volume = recent_avg * weekly_multipliers.get(day_of_week, 1.0)
-            
-            # Add confidence intervals
-            confidence_interval = recent_std if recent_std > 0 else predicted_volume * 0.2
-            
-            forecast_points.append({
-                "date": forecast_date.isoformat(),
-                "predicted_volume": round(predicted_volume, 2),
-                "confidence_lower": max(0, round(predicted_volume - (1.96 * confidence_interval), 2)),
-                "confidence_upper": round(predicted_volume + (1.96 * confidence_interval), 2),
-                "day_of_week": forecast_date.strftime("%A"),
+        recent_avg, recent_std = daily_volumes['total_volume'].tail(7).agg(['mean', 'std'])
+        
+        # Calculate weekly patterns as a multiplier table indexed by weekday (Monday=0);
+        # weekdays without history keep a neutral multiplier
+        weekly_pattern = volume_df.groupby(volume_df['timestamp'].dt.dayofweek)['target_value'].mean()
+        weekly_multipliers = np.ones(7)
+        weekly_multipliers[weekly_pattern.index.to_numpy()] = (weekly_pattern / weekly_pattern.mean()).to_numpy()
+        
+        # Forecast horizon as arrays, one entry per day ahead
+        forecast_dates = pd.date_range(base_date + timedelta(days=1), periods=forecast_horizon_days, freq='D')
+        days_of_week = forecast_dates.dayofweek.to_numpy()
+        
+        # Apply weekly pattern
+        predicted_volumes = recent_avg * weekly_multipliers[days_of_week]
+        
+        # Add confidence intervals
+        confidence_intervals = np.full(forecast_horizon_days, recent_std) if recent_std > 0 else predicted_volumes * 0.2
+        confidence_lower = np.maximum(0, np.round(predicted_volumes - (1.96 * confidence_intervals), 2))
+        confidence_upper = np.round(predicted_volumes + (1.96 * confidence_intervals), 2)
+        
+        # Date strings and weekday names formatted once for the whole horizon
+        forecast_points = [
+            {
+                "date": forecast_date,
+                "predicted_volume": value,
+                "confidence_lower": lower,
+                "confidence_upper": upper,
+                "day_of_week": day_name,
                 "is_weekday": day_of_week < 5
-            })
+            }
+            for forecast_date, day_name, day_of_week, value, lower, upper in zip(
+                forecast_dates.strftime('%Y-%m-%d').tolist(), forecast_dates.day_name().tolist(),
+                days_of_week.tolist(), np.round(predicted_volumes, 2).tolist(),
+                confidence_lower.tolist(), confidence_upper.tolist()
+            )
+        ]
         
         volume_forecast = {
             "forecast_type": "VOLUME",
             "aggregation_level": "daily",
             "horizon_days": forecast_horizon_days,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": self.generated_at,
             "predictor_name": "volume_pattern_model",
             "historical_data_points": len(daily_volumes),
             "forecast_points": forecast_points,
@@ -231,58 +325,22 @@ class ForecastGenerator:
         print(f"Generated volume forecast with {len(forecast_points)} daily predictions")
         return [volume_forecast]
     
-    def calculate_trend(self, values: np.array) -> float:
-        """Calculate simple linear trend"""
-        if len(values) < 2:
-            return 0.0
-        
-        x = np.arange(len(values)).reshape(-1, 1)
-        y = values
-        
-        try:
-            model = LinearRegression()
-            model.fit(x, y)
-            return model.coef_[0]
-        except:
-            return 0.0
-    
-    def get_seasonal_factor(self, forecast_date: datetime) -> float:
-        """Get seasonal adjustment factor based on date"""
-        # Simple seasonal factors
-        day_of_week = forecast_date.weekday()
-        
-        # Business days vs weekends
-        if day_of_week < 5:  # Monday to Friday
-            return 1.1
-        else:  # Weekend
-            return 0.7
-    
-    def calculate_accuracy_score(self, sku_data: pd.DataFrame) -> float:
-        """Calculate accuracy score based on data stability"""
-        if len(sku_data) < 3:
-            return 0.5
-        
-        # Calculate coefficient of variation as a proxy for predictability
-        mean_val = sku_data['target_value'].mean()
-        std_val = sku_data['target_value'].std()
-        
-        if mean_val == 0:
-            return 0.5
-        
-        cv = std_val / mean_val
-        
-        # Convert CV to accuracy score (lower CV = higher accuracy)
-        accuracy = max(0.3, min(0.95, 1.0 - (cv / 2)))
-        return round(accuracy, 3)
+    def upload_json(self, data: Any, key: str):
+        """Upload data as gzip-compressed compact JSON; large bodies go through the multipart transfer manager"""
+        self.s3_client.upload_fileobj(
+            io.BytesIO(gzip.compress(serialize_json(data), compresslevel=4)),
+            self.bucket_name,
+            key,
+            Config=UPLOAD_CONFIG,
+            ExtraArgs={'ContentType': 'application/json', 'ContentEncoding': 'gzip'}
+        )
     
     def save_forecasts_to_s3(self, forecasts: List[Dict[str, Any]], forecast_type: str):
         """Save generated forecasts to S3"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
         # Save as JSON
         forecast_data = {
             "generation_metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": self.generated_at,
                 "forecast_type": forecast_type,
                 "total_forecasts": len(forecasts),
                 "generation_method": "statistical_extrapolation",
@@ -292,14 +350,9 @@ class ForecastGenerator:
         }
         
         # Upload to S3
-        key = f"forecasts/forecast-output/{forecast_type.lower()}-forecasts-{timestamp}.json"
+        key = f"forecasts/forecast-output/{forecast_type.lower()}-forecasts-{self.run_stamp}.json.gz"
         
-        self.s3_client.put_object(
-            Bucket=self.bucket_name,
-            Key=key,
-            Body=json.dumps(forecast_data, indent=2),
-            ContentType='application/json'
-        )
+        self.upload_json(forecast_data, key)
         
         print(f"Saved {len(forecasts)} {forecast_type} forecasts to s3://{self.bucket_name}/{key}")
         return key
@@ -320,7 +373,7 @@ class ForecastGenerator:
         
         summary = {
             "summary_metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": self.generated_at,
                 "generation_method": "statistical_model_pilot",
                 "forecast_horizon_days": 28
             },
@@ -344,13 +397,8 @@ class ForecastGenerator:
         }
         
         # Save summary
-        key = f"forecasts/forecast-output/forecast-summary-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        self.s3_client.put_object(
-            Bucket=self.bucket_name,
-            Key=key,
-            Body=json.dumps(summary, indent=2),
-            ContentType='application/json'
-        )
+        key = f"forecasts/forecast-output/forecast-summary-{self.run_stamp}.json.gz"
+        self.upload_json(summary, key)
         
         print(f"Saved forecast summary to s3://{self.bucket_name}/{key}")
         return summary
@@ -360,6 +408,8 @@ class ForecastGenerator:
         print("🚀 Starting Forecast Generation Process...")
         print("=" * 60)
         
+        self.start_run()
+        
         # Generate demand forecasts
         print("\n📊 Phase 1: Demand Forecasting")
         demand_forecasts = self.generate_demand_forecasts(forecast_horizon_days=28)